@@ -1,25 +1,81 @@
 from __future__ import annotations
 
+import re
 from abc import ABC, abstractmethod
-from typing import Optional
+from datetime import datetime, timezone
+from typing import Any, List, Optional
 
-from src.http import HttpClient
+from src.config import CEX_EXCHANGES, DEX_EXCHANGES, ExchangeMeta
+from src.http import HttpClient, ResponseTiming
 from src.models import P2POffer, PriceQuote
 
 
+FRACTION_DIGITS = re.compile(r"(\.\d{6})\d+")
+
+
+# Event times are best-effort: an unparseable value falls back to the receive
+# time rather than failing the price fetch.
+def parse_epoch_ms(value: Any) -> Optional[datetime]:
+    if value in (None, ""):
+        return None
+    try:
+        return datetime.fromtimestamp(float(value) / 1000, tz=timezone.utc)
+    except (ValueError, TypeError, OverflowError, OSError):
+        return None
+
+
+def parse_iso_time(value: Any) -> Optional[datetime]:
+    if not value:
+        return None
+    text = str(value)
+    # fromisoformat only accepts a trailing "Z" from Python 3.11, and never more
+    # than microsecond precision.
+    if text.endswith(("Z", "z")):
+        text = text[:-1] + "+00:00"
+    text = FRACTION_DIGITS.sub(r"\1", text)
+    try:
+        parsed = datetime.fromisoformat(text)
+    except (ValueError, TypeError):
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
 class PriceAdapter(ABC):
-    def __init__(self, exchange_id: str) -> None:
+    # Primary URL the adapter requests; used to group venues by host.
+    endpoint: str = ""
+
+    def __init__(self, exchange_id: str, meta: Optional[ExchangeMeta] = None) -> None:
         self.exchange_id = exchange_id
+        self.meta = meta or CEX_EXCHANGES.get(exchange_id) or DEX_EXCHANGES[exchange_id]
 
     @abstractmethod
     async def fetch(self, client: HttpClient) -> PriceQuote:
         raise NotImplementedError
 
+    def stamp(
+        self,
+        quote: PriceQuote,
+        timing: ResponseTiming,
+        source_time: Optional[datetime] = None,
+        quote_currency: Optional[str] = None,
+    ) -> PriceQuote:
+        quote.quote_currency = quote_currency or self.meta.quote_currency
+        quote.source_time = source_time
+        quote.received_at = timing.received_at
+        quote.latency_ms = timing.latency_ms
+        quote.last_updated = source_time or timing.received_at
+        return quote
+
 
 class P2PAdapter(ABC):
+    # Venues whose endpoint returns the whole book in one response set this to 1.
+    max_pages: Optional[int] = None
+
     def __init__(self, exchange_id: str) -> None:
         self.exchange_id = exchange_id
 
     @abstractmethod
-    async def fetch_best_offer(self, client: HttpClient) -> Optional[P2POffer]:
+    async def fetch_page(self, client: HttpClient, fiat: str, side: str, page: int, page_size: int) -> List[P2POffer]:
         raise NotImplementedError
@@ -1,98 +1,122 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
-from src.adapters.base import PriceAdapter
-from src.config import CEX_EXCHANGES
+from src.adapters.base import PriceAdapter, parse_epoch_ms, parse_iso_time
+from src.config import CEX_ENDPOINTS, CEX_EXCHANGES, ExchangeMeta
 from src.http import HttpClient
 from src.models import PriceQuote
 
 
-class BinanceAdapter(PriceAdapter):
-    async def fetch(self, client: HttpClient) -> PriceQuote:
-        data = await client.get_json("https://api.binance.com/api/v3/ticker/price", params={"symbol": "SOLUSDT"})
-        price = float(data["price"])
-        meta = CEX_EXCHANGES[self.exchange_id]
-        return PriceQuote(self.exchange_id, meta.name, meta.kind, meta.chain, price, meta.source, None, datetime.now(timezone.utc), meta.fee_bps)
-
-
-class GateAdapter(PriceAdapter):
-    async def fetch(self, client: HttpClient) -> PriceQuote:
-        data = await client.get_json("https://api.gateio.ws/api/v4/spot/tickers", params={"currency_pair": "SOL_USDT"})
-        price = float(data[0]["last"])
-        meta = CEX_EXCHANGES[self.exchange_id]
-        liquidity = float(data[0].get("quote_volume", 0))
-        return PriceQuote(self.exchange_id, meta.name, meta.kind, meta.chain, price, meta.source, liquidity, datetime.now(timezone.utc), meta.fee_bps)
-
-
-class BybitAdapter(PriceAdapter):
-    async def fetch(self, client: HttpClient) -> PriceQuote:
-        data = await client.get_json(
-            "https://api.bybit.com/v5/market/tickers",
-            params={"category": "spot", "symbol": "SOLUSDT"},
+Extractor = Callable[[Any], Any]
+
+
+def compile_path(path: str) -> Extractor:
+    # "result.list.0.lastPrice" -> lookup chain resolved once at load time.
+    keys: Tuple[Any, ...] = tuple(int(part) if part.isdigit() else part for part in path.split("."))
+
+    def extract(data: Any) -> Any:
+        for key in keys:
+            data = data[key]
+        return data
+
+    return extract
+
+
+def optional_path(path: Optional[str]) -> Optional[Extractor]:
+    if not path:
+        return None
+    extract = compile_path(path)
+
+    def extract_optional(data: Any) -> Any:
+        try:
+            return extract(data)
+        except (KeyError, IndexError, TypeError):
+            return None
+
+    return extract_optional
+
+
+@dataclass(frozen=True)
+class VenueSpec:
+    exchange_id: str
+    meta: ExchangeMeta
+    url: str
+    params: Dict[str, Any] = field(default_factory=dict)
+    price: str = "price"
+    liquidity: Optional[str] = None
+    source_time: Optional[str] = None
+    time_format: str = "ms"
+
+    @classmethod
+    def from_dict(cls, exchange_id: str, data: Dict[str, Any], meta: Optional[ExchangeMeta] = None) -> "VenueSpec":
+        if meta is None:
+            meta = ExchangeMeta(
+                data["name"],
+                "CEX",
+                data.get("chain", "Solana"),
+                data.get("source", "REST"),
+                float(data.get("fee_bps", 10)),
+                data.get("quote_currency", "USDT"),
+            )
+        return cls(
+            exchange_id,
+            meta,
+            data["url"],
+            dict(data.get("params", {})),
+            data.get("price", "price"),
+            data.get("liquidity"),
+            data.get("source_time"),
+            data.get("time_format", "ms"),
         )
-        price = float(data["result"]["list"][0]["lastPrice"])
-        meta = CEX_EXCHANGES[self.exchange_id]
-        liquidity = float(data["result"]["list"][0].get("turnover24h", 0))
-        return PriceQuote(self.exchange_id, meta.name, meta.kind, meta.chain, price, meta.source, liquidity, datetime.now(timezone.utc), meta.fee_bps)
 
 
-class OkxAdapter(PriceAdapter):
-    async def fetch(self, client: HttpClient) -> PriceQuote:
-        data = await client.get_json("https://www.okx.com/api/v5/market/ticker", params={"instId": "SOL-USDT"})
-        price = float(data["data"][0]["last"])
-        meta = CEX_EXCHANGES[self.exchange_id]
-        liquidity = float(data["data"][0].get("volCcy24h", 0))
-        return PriceQuote(self.exchange_id, meta.name, meta.kind, meta.chain, price, meta.source, liquidity, datetime.now(timezone.utc), meta.fee_bps)
-
-
-class BitgetAdapter(PriceAdapter):
-    async def fetch(self, client: HttpClient) -> PriceQuote:
-        data = await client.get_json("https://api.bitget.com/api/v2/spot/market/tickers", params={"symbol": "SOLUSDT"})
-        price = float(data["data"][0]["lastPr"])
-        meta = CEX_EXCHANGES[self.exchange_id]
-        liquidity = float(data["data"][0].get("quoteVol", 0))
-        return PriceQuote(self.exchange_id, meta.name, meta.kind, meta.chain, price, meta.source, liquidity, datetime.now(timezone.utc), meta.fee_bps)
-
+class DeclarativeCexAdapter(PriceAdapter):
+    def __init__(self, spec: VenueSpec) -> None:
+        super().__init__(spec.exchange_id, spec.meta)
+        self.spec = spec
+        self.endpoint = spec.url
+        self._price = compile_path(spec.price)
+        self._liquidity = optional_path(spec.liquidity)
+        self._source_time = optional_path(spec.source_time)
+        self._parse_time = parse_iso_time if spec.time_format == "iso" else parse_epoch_ms
 
-class CoinbaseAdapter(PriceAdapter):
     async def fetch(self, client: HttpClient) -> PriceQuote:
-        data = await client.get_json("https://api.exchange.coinbase.com/products/SOL-USD/ticker")
-        price = float(data["price"])
-        meta = CEX_EXCHANGES[self.exchange_id]
-        return PriceQuote(self.exchange_id, meta.name, meta.kind, meta.chain, price, meta.source, None, datetime.now(timezone.utc), meta.fee_bps)
-
-
-class UpbitAdapter(PriceAdapter):
-    async def fetch(self, client: HttpClient) -> PriceQuote:
-        data = await client.get_json("https://api.upbit.com/v1/ticker", params={"markets": "USDT-SOL"})
-        price = float(data[0]["trade_price"])
-        meta = CEX_EXCHANGES[self.exchange_id]
-        liquidity = float(data[0].get("acc_trade_price_24h", 0))
-        return PriceQuote(self.exchange_id, meta.name, meta.kind, meta.chain, price, meta.source, liquidity, datetime.now(timezone.utc), meta.fee_bps)
-
-
-class KuCoinAdapter(PriceAdapter):
-    async def fetch(self, client: HttpClient) -> PriceQuote:
-        data = await client.get_json("https://api.kucoin.com/api/v1/market/orderbook/level1", params={"symbol": "SOL-USDT"})
-        price = float(data["data"]["price"])
-        meta = CEX_EXCHANGES[self.exchange_id]
-        liquidity = float(data["data"].get("volValue", 0))
-        return PriceQuote(self.exchange_id, meta.name, meta.kind, meta.chain, price, meta.source, liquidity, datetime.now(timezone.utc), meta.fee_bps)
-
-
-class MexcAdapter(PriceAdapter):
-    async def fetch(self, client: HttpClient) -> PriceQuote:
-        data = await client.get_json("https://api.mexc.com/api/v3/ticker/price", params={"symbol": "SOLUSDT"})
-        price = float(data["price"])
-        meta = CEX_EXCHANGES[self.exchange_id]
-        return PriceQuote(self.exchange_id, meta.name, meta.kind, meta.chain, price, meta.source, None, datetime.now(timezone.utc), meta.fee_bps)
-
-
-class HtxAdapter(PriceAdapter):
-    async def fetch(self, client: HttpClient) -> PriceQuote:
-        data = await client.get_json("https://api.huobi.pro/market/trade", params={"symbol": "solusdt"})
-        price = float(data["tick"]["data"][0]["price"])
-        meta = CEX_EXCHANGES[self.exchange_id]
-        liquidity = float(data["tick"].get("amount", 0))
-        return PriceQuote(self.exchange_id, meta.name, meta.kind, meta.chain, price, meta.source, liquidity, datetime.now(timezone.utc), meta.fee_bps)
+        data, timing = await client.get_json_timed(self.spec.url, params=self.spec.params or None)
+        price = float(self._price(data))
+        liquidity = self._liquidity(data) if self._liquidity else None
+        meta = self.meta
+        quote = PriceQuote(
+            self.exchange_id,
+            meta.name,
+            meta.kind,
+            meta.chain,
+            price,
+            meta.source,
+            float(liquidity) if liquidity is not None else None,
+            timing.received_at,
+            meta.fee_bps,
+        )
+        source_time = self._parse_time(self._source_time(data)) if self._source_time else None
+        return self.stamp(quote, timing, source_time)
+
+
+def load_cex_specs(extra: Optional[Dict[str, Dict[str, Any]]] = None) -> List[VenueSpec]:
+    specs = [VenueSpec.from_dict(exchange_id, data, CEX_EXCHANGES[exchange_id]) for exchange_id, data in CEX_ENDPOINTS.items()]
+    known = {spec.exchange_id for spec in specs}
+    for exchange_id, data in (extra or {}).items():
+        spec = VenueSpec.from_dict(exchange_id, data, CEX_EXCHANGES.get(exchange_id) if "name" not in data else None)
+        if exchange_id in known:
+            specs = [spec if existing.exchange_id == exchange_id else existing for existing in specs]
+        else:
+            specs.append(spec)
+    return specs
+
+
+def build_cex_adapters(
+    extra: Optional[Dict[str, Dict[str, Any]]] = None,
+    disabled: Iterable[str] = (),
+) -> List[PriceAdapter]:
+    skip = set(disabled)
+    return [DeclarativeCexAdapter(spec) for spec in load_cex_specs(extra) if spec.exchange_id not in skip]
@@ -1,42 +1,89 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
-from typing import Optional
+import asyncio
+import math
+from dataclasses import dataclass
+from typing import Any, Dict, List, Sequence, Tuple
 
 from src.adapters.base import PriceAdapter
-from src.config import DEX_EXCHANGES
-from src.http import HttpClient
+from src.config import (
+    DEFAULT_ORDER_SIZE_USD,
+    DEX_EXCHANGES,
+    JUPITER_BUCKET_RATIO,
+    JUPITER_MIN_BUCKET_USD,
+    JUPITER_SLIPPAGE_BPS,
+    PAIR_METADATA_TTL_SECONDS,
+)
+from src.http import HttpClient, ResponseTiming
 from src.models import PriceQuote
 
 
 DEXSCREENER_SEARCH_URL = "https://api.dexscreener.com/latest/dex/search"
+DEXSCREENER_PAIRS_URL = "https://api.dexscreener.com/latest/dex/pairs/solana/"
+PAIR_METADATA_KEY = "dexscreener:solana:SOL/USDC"
+JUPITER_PRICE_URL = "https://price.jup.ag/v6/price"
+JUPITER_QUOTE_URL = "https://quote-api.jup.ag/v6/quote"
+USDC_MINT = "EPjFWvd5wAxfuBREjfNbpgcNbqe1KYn2qW8GLJXGWjgQ"
+SOL_MINT = "So11111111111111111111111111111111111111112"
+USDC_DECIMALS = 6
+SOL_DECIMALS = 9
+
+
+def pair_liquidity(pair: Dict[str, Any]) -> float:
+    return float(pair.get("liquidity", {}).get("usd", 0))
+
+
+async def load_solana_pairs(client: HttpClient, dex_id: str) -> Tuple[List[Dict[str, Any]], ResponseTiming]:
+    # Discovered pair addresses (best pool per DEX) are kept as metadata so later
+    # cycles and warm-started runs hit the small pairs endpoint instead of search.
+    addresses: Dict[str, str] = client.get_metadata(PAIR_METADATA_KEY) or {}
+    if dex_id in addresses:
+        url = DEXSCREENER_PAIRS_URL + ",".join(sorted(addresses.values()))
+        data, timing = await client.get_json_timed(url, ttl=10)
+        return data.get("pairs") or [], timing
+    data, timing = await client.get_json_timed(DEXSCREENER_SEARCH_URL, params={"q": "SOL/USDC"}, ttl=10)
+    pairs = [pair for pair in data.get("pairs") or [] if pair.get("chainId") == "solana"]
+    best: Dict[str, Dict[str, Any]] = {}
+    for pair in pairs:
+        current = best.get(pair.get("dexId"))
+        if pair.get("pairAddress") and (current is None or pair_liquidity(pair) > pair_liquidity(current)):
+            best[pair["dexId"]] = pair
+    discovered = {dex: pair["pairAddress"] for dex, pair in best.items() if dex in DEX_EXCHANGES}
+    if discovered and discovered != addresses:
+        client.set_metadata(PAIR_METADATA_KEY, {**addresses, **discovered}, PAIR_METADATA_TTL_SECONDS)
+    return pairs, timing
 
 
 class DexScreenerAdapter(PriceAdapter):
     dex_id: str
+    endpoint = DEXSCREENER_SEARCH_URL
 
     def __init__(self, exchange_id: str, dex_id: str) -> None:
         super().__init__(exchange_id)
         self.dex_id = dex_id
 
     async def fetch(self, client: HttpClient) -> PriceQuote:
-        params = {"q": "SOL/USDC"}
-        data = await client.get_json(DEXSCREENER_SEARCH_URL, params=params, ttl=10)
-        pairs = [
-            pair
-            for pair in data.get("pairs", [])
-            if pair.get("chainId") == "solana" and pair.get("dexId") == self.dex_id
-        ]
+        solana_pairs, timing = await load_solana_pairs(client, self.dex_id)
+        pairs = [pair for pair in solana_pairs if pair.get("dexId") == self.dex_id]
         if not pairs:
             raise RuntimeError(f"No DexScreener pairs found for {self.dex_id}")
-        best_pair = max(pairs, key=lambda item: float(item.get("liquidity", {}).get("usd", 0)))
-        price = float(best_pair["priceUsd"])
-        liquidity = float(best_pair.get("liquidity", {}).get("usd", 0))
+        best_pair = max(pairs, key=pair_liquidity)
+        # priceUsd is DexScreener's own USD conversion; prefer the native stablecoin
+        # price so the normalizer applies one consistent stablecoin rate.
+        quote_symbol = best_pair.get("quoteToken", {}).get("symbol", "").upper()
+        base_symbol = best_pair.get("baseToken", {}).get("symbol", "").upper()
+        if base_symbol == "SOL" and quote_symbol in ("USDC", "USDT") and best_pair.get("priceNative"):
+            price = float(best_pair["priceNative"])
+            quote_currency = quote_symbol
+        else:
+            price = float(best_pair["priceUsd"])
+            quote_currency = "USD"
+        liquidity = pair_liquidity(best_pair)
         meta = DEX_EXCHANGES[self.exchange_id]
         warnings = []
         if liquidity < 100000:
             warnings.append("Low liquidity")
-        return PriceQuote(
+        quote = PriceQuote(
             self.exchange_id,
             meta.name,
             meta.kind,
@@ -44,18 +91,86 @@ class DexScreenerAdapter(PriceAdapter):
             price,
             meta.source,
             liquidity,
-            datetime.now(timezone.utc),
+            timing.received_at,
             meta.fee_bps,
             warnings,
         )
+        # DexScreener pair payloads carry no per-update timestamp, so the
+        # local receive time of the (possibly cached) response is the best bound.
+        return self.stamp(quote, timing, quote_currency=quote_currency)
+
+
+@dataclass
+class RouteQuote:
+    size_usd: float
+    price: float
+    price_impact: float
+    timing: ResponseTiming
+
+
+def bucket_edges(size_usd: float) -> Tuple[float, float]:
+    # Order sizes snap to a logarithmic grid so nearby sizes share cached quotes.
+    size = max(size_usd, JUPITER_MIN_BUCKET_USD)
+    index = math.floor(math.log(size / JUPITER_MIN_BUCKET_USD, JUPITER_BUCKET_RATIO) + 1e-9)
+    lower = round(JUPITER_MIN_BUCKET_USD * JUPITER_BUCKET_RATIO**index, 2)
+    upper = round(JUPITER_MIN_BUCKET_USD * JUPITER_BUCKET_RATIO ** (index + 1), 2)
+    return lower, upper
+
+
+async def fetch_route_quote(client: HttpClient, size_usd: float) -> RouteQuote:
+    params = {
+        "inputMint": USDC_MINT,
+        "outputMint": SOL_MINT,
+        "amount": int(round(size_usd * 10**USDC_DECIMALS)),
+        "slippageBps": JUPITER_SLIPPAGE_BPS,
+    }
+    data, timing = await client.get_json_timed(JUPITER_QUOTE_URL, params=params, ttl=5)
+    in_amount = int(data["inAmount"]) / 10**USDC_DECIMALS
+    out_amount = int(data["outAmount"]) / 10**SOL_DECIMALS
+    return RouteQuote(size_usd, in_amount / out_amount, float(data.get("priceImpactPct") or 0), timing)
+
+
+def interpolate_route(size_usd: float, lower: RouteQuote, upper: RouteQuote) -> RouteQuote:
+    if upper.size_usd == lower.size_usd:
+        return RouteQuote(size_usd, lower.price, lower.price_impact, lower.timing)
+    position = math.log(max(size_usd, lower.size_usd) / lower.size_usd) / math.log(upper.size_usd / lower.size_usd)
+    position = min(max(position, 0.0), 1.0)
+    return RouteQuote(
+        size_usd,
+        lower.price + position * (upper.price - lower.price),
+        lower.price_impact + position * (upper.price_impact - lower.price_impact),
+        max(lower.timing, upper.timing, key=lambda timing: timing.received_at),
+    )
+
+
+async def quote_ladder(client: HttpClient, sizes: Sequence[float]) -> Dict[float, RouteQuote]:
+    edges = {size: bucket_edges(size) for size in sizes}
+    unique_edges = sorted({edge for pair in edges.values() for edge in pair})
+    results = await asyncio.gather(*[fetch_route_quote(client, edge) for edge in unique_edges], return_exceptions=True)
+    quoted = {edge: result for edge, result in zip(unique_edges, results) if not isinstance(result, Exception)}
+    ladder: Dict[float, RouteQuote] = {}
+    for size, (lower, upper) in edges.items():
+        low_quote = quoted.get(lower) or quoted.get(upper)
+        high_quote = quoted.get(upper) or quoted.get(lower)
+        if low_quote and high_quote:
+            ladder[size] = interpolate_route(size, low_quote, high_quote)
+    return ladder
 
 
 class JupiterAdapter(PriceAdapter):
+    def __init__(self, exchange_id: str, mode: str = "spot", order_size: float = DEFAULT_ORDER_SIZE_USD) -> None:
+        super().__init__(exchange_id)
+        self.mode = mode
+        self.order_size = order_size
+        self.endpoint = JUPITER_QUOTE_URL if mode == "route" else JUPITER_PRICE_URL
+
     async def fetch(self, client: HttpClient) -> PriceQuote:
-        data = await client.get_json("https://price.jup.ag/v6/price", params={"ids": "SOL"}, ttl=5)
+        if self.mode == "route":
+            return await self.fetch_route(client)
+        data, timing = await client.get_json_timed(JUPITER_PRICE_URL, params={"ids": "SOL"}, ttl=5)
         price = float(data["data"]["SOL"]["price"])
         meta = DEX_EXCHANGES[self.exchange_id]
-        return PriceQuote(
+        quote = PriceQuote(
             self.exchange_id,
             meta.name,
             meta.kind,
@@ -63,17 +178,39 @@ class JupiterAdapter(PriceAdapter):
             price,
             meta.source,
             None,
-            datetime.now(timezone.utc),
+            timing.received_at,
             meta.fee_bps,
             ["Aggregator pricing"],
         )
+        return self.stamp(quote, timing)
+
+    async def fetch_route(self, client: HttpClient) -> PriceQuote:
+        # The ranked quote is for the exact order size; only what-if ladders snap
+        # to bucket edges and interpolate.
+        route = await fetch_route_quote(client, self.order_size)
+        meta = DEX_EXCHANGES[self.exchange_id]
+        # The routed out-amount is already net of pool fees and price impact.
+        quote = PriceQuote(
+            self.exchange_id,
+            meta.name,
+            meta.kind,
+            meta.chain,
+            route.price,
+            meta.source,
+            None,
+            route.timing.received_at,
+            0,
+            [f"Routed quote for ${self.order_size:,.0f}"],
+        )
+        quote.price_impact = route.price_impact
+        return self.stamp(quote, route.timing)
 
 
-def build_dex_adapters() -> list[PriceAdapter]:
+def build_dex_adapters(jupiter_mode: str = "spot", order_size: float = DEFAULT_ORDER_SIZE_USD) -> list[PriceAdapter]:
     return [
         DexScreenerAdapter("raydium", "raydium"),
         DexScreenerAdapter("orca", "orca"),
-        JupiterAdapter("jupiter"),
+        JupiterAdapter("jupiter", jupiter_mode, order_size),
         DexScreenerAdapter("meteora", "meteora"),
         DexScreenerAdapter("openbook", "openbook"),
         DexScreenerAdapter("lifinity", "lifinity"),
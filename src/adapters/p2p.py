@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Any, List, Optional
 
 from src.adapters.base import P2PAdapter
 from src.config import P2P_EXCHANGES
@@ -9,70 +9,95 @@ from src.http import HttpClient
 from src.models import P2POffer
 
 
+def optional_float(value: Any) -> Optional[float]:
+    if value in (None, ""):
+        return None
+    return float(value)
+
+
+def optional_int(value: Any) -> Optional[int]:
+    if value in (None, ""):
+        return None
+    return int(float(value))
+
+
 class BinanceP2PAdapter(P2PAdapter):
-    async def fetch_best_offer(self, client: HttpClient) -> Optional[P2POffer]:
+    async def fetch_page(self, client: HttpClient, fiat: str, side: str, page: int, page_size: int) -> List[P2POffer]:
         payload = {
             "asset": "SOL",
-            "fiat": "USD",
-            "tradeType": "BUY",
-            "page": 1,
-            "rows": 10,
+            "fiat": fiat,
+            "tradeType": side.upper(),
+            "page": page,
+            "rows": page_size,
             "payTypes": [],
             "publisherType": None,
         }
         data = await client.post_json("https://p2p.binance.com/bapi/c2c/v2/friendly/c2c/adv/search", payload, ttl=10)
-        offers = data.get("data", [])
-        if not offers:
-            return None
-        best = offers[0]
         meta = P2P_EXCHANGES[self.exchange_id]
-        return P2POffer(
-            self.exchange_id,
-            meta.name,
-            float(best["adv"]["price"]),
-            [payment["identifier"] for payment in best["adv"].get("tradeMethods", [])],
-            float(best["adv"].get("minSingleTransAmount", 0)),
-            float(best["adv"].get("maxSingleTransAmount", 0)),
-            None,
-            best["adv"].get("country"),
-            datetime.now(timezone.utc),
-        )
+        offers = []
+        for item in data.get("data") or []:
+            adv = item["adv"]
+            advertiser = item.get("advertiser", {})
+            offers.append(
+                P2POffer(
+                    self.exchange_id,
+                    meta.name,
+                    float(adv["price"]),
+                    [payment["identifier"] for payment in adv.get("tradeMethods", [])],
+                    float(adv.get("minSingleTransAmount", 0)),
+                    float(adv.get("maxSingleTransAmount", 0)),
+                    None,
+                    adv.get("country"),
+                    datetime.now(timezone.utc),
+                    fiat,
+                    optional_float(advertiser.get("monthFinishRate")),
+                    optional_int(advertiser.get("monthOrderCount")),
+                )
+            )
+        return offers
 
 
 class BybitP2PAdapter(P2PAdapter):
-    async def fetch_best_offer(self, client: HttpClient) -> Optional[P2POffer]:
+    async def fetch_page(self, client: HttpClient, fiat: str, side: str, page: int, page_size: int) -> List[P2POffer]:
         params = {
             "tokenId": "SOL",
-            "currencyId": "USD",
-            "side": 1,
-            "page": 1,
-            "size": 10,
+            "currencyId": fiat,
+            "side": 1 if side == "buy" else 0,
+            "page": page,
+            "size": page_size,
         }
         data = await client.get_json("https://api2.bybit.com/fiat/otc/item/online", params=params, ttl=10)
-        items = data.get("result", {}).get("items", [])
-        if not items:
-            return None
-        best = items[0]
         meta = P2P_EXCHANGES[self.exchange_id]
-        return P2POffer(
-            self.exchange_id,
-            meta.name,
-            float(best["price"]),
-            [method.get("paymentName") for method in best.get("payments", [])],
-            float(best.get("minAmount", 0)),
-            float(best.get("maxAmount", 0)),
-            None,
-            None,
-            datetime.now(timezone.utc),
-        )
+        offers = []
+        for item in data.get("result", {}).get("items") or []:
+            completion = optional_float(item.get("recentExecuteRate"))
+            offers.append(
+                P2POffer(
+                    self.exchange_id,
+                    meta.name,
+                    float(item["price"]),
+                    [method.get("paymentName") for method in item.get("payments", []) if isinstance(method, dict)],
+                    float(item.get("minAmount", 0)),
+                    float(item.get("maxAmount", 0)),
+                    None,
+                    None,
+                    datetime.now(timezone.utc),
+                    fiat,
+                    completion / 100 if completion is not None else None,
+                    optional_int(item.get("recentOrderNum")),
+                )
+            )
+        return offers
 
 
 class OkxP2PAdapter(P2PAdapter):
-    async def fetch_best_offer(self, client: HttpClient) -> Optional[P2POffer]:
+    max_pages = 1
+
+    async def fetch_page(self, client: HttpClient, fiat: str, side: str, page: int, page_size: int) -> List[P2POffer]:
         params = {
             "baseCurrency": "SOL",
-            "quoteCurrency": "USD",
-            "side": "buy",
+            "quoteCurrency": fiat,
+            "side": side,
             "paymentMethod": "all",
             "userType": "all",
             "showTrade": "false",
@@ -81,78 +106,89 @@ class OkxP2PAdapter(P2PAdapter):
             "isAbleFilter": "false",
         }
         data = await client.get_json("https://www.okx.com/v3/c2c/tradingOrders/books", params=params, ttl=10)
-        offers = data.get("data", {}).get("sell", [])
-        if not offers:
-            return None
-        best = offers[0]
+        # Buyers take the sell side of the book and vice versa.
+        book_side = "sell" if side == "buy" else "buy"
         meta = P2P_EXCHANGES[self.exchange_id]
-        return P2POffer(
-            self.exchange_id,
-            meta.name,
-            float(best["price"]),
-            [method.get("payMethod") for method in best.get("paymentMethods", [])],
-            float(best.get("minAmount", 0)),
-            float(best.get("maxAmount", 0)),
-            None,
-            best.get("quoteName"),
-            datetime.now(timezone.utc),
-        )
+        offers = []
+        for item in data.get("data", {}).get(book_side) or []:
+            offers.append(
+                P2POffer(
+                    self.exchange_id,
+                    meta.name,
+                    float(item["price"]),
+                    [method.get("payMethod") for method in item.get("paymentMethods", []) if isinstance(method, dict)],
+                    float(item.get("minAmount", 0)),
+                    float(item.get("maxAmount", 0)),
+                    None,
+                    item.get("quoteName"),
+                    datetime.now(timezone.utc),
+                    fiat,
+                    optional_float(item.get("completedRate")),
+                    optional_int(item.get("completedOrderQuantity")),
+                )
+            )
+        return offers
 
 
 class GateP2PAdapter(P2PAdapter):
-    async def fetch_best_offer(self, client: HttpClient) -> Optional[P2POffer]:
+    async def fetch_page(self, client: HttpClient, fiat: str, side: str, page: int, page_size: int) -> List[P2POffer]:
         params = {
             "currency": "SOL",
-            "fiat": "USD",
-            "side": "buy",
-            "page": 1,
-            "limit": 10,
+            "fiat": fiat,
+            "side": side,
+            "page": page,
+            "limit": page_size,
         }
         data = await client.get_json("https://www.gate.io/json_svr/query/?u=1&c=otc&a=order_list", params=params, ttl=10)
-        offers = data.get("data", []) if isinstance(data, dict) else []
-        if not offers:
-            return None
-        best = offers[0]
+        items = data.get("data", []) if isinstance(data, dict) else []
         meta = P2P_EXCHANGES[self.exchange_id]
-        return P2POffer(
-            self.exchange_id,
-            meta.name,
-            float(best.get("price", 0)),
-            [method for method in best.get("payTypes", [])],
-            float(best.get("min", 0)),
-            float(best.get("max", 0)),
-            None,
-            None,
-            datetime.now(timezone.utc),
-        )
+        offers = []
+        for item in items or []:
+            offers.append(
+                P2POffer(
+                    self.exchange_id,
+                    meta.name,
+                    float(item.get("price", 0)),
+                    [method for method in item.get("payTypes", [])],
+                    float(item.get("min", 0)),
+                    float(item.get("max", 0)),
+                    None,
+                    None,
+                    datetime.now(timezone.utc),
+                    fiat,
+                )
+            )
+        return offers
 
 
 class BitgetP2PAdapter(P2PAdapter):
-    async def fetch_best_offer(self, client: HttpClient) -> Optional[P2POffer]:
+    async def fetch_page(self, client: HttpClient, fiat: str, side: str, page: int, page_size: int) -> List[P2POffer]:
         params = {
-            "side": "buy",
+            "side": side,
             "coin": "SOL",
-            "fiat": "USD",
-            "pageSize": 10,
-            "pageNo": 1,
+            "fiat": fiat,
+            "pageSize": page_size,
+            "pageNo": page,
         }
         data = await client.get_json("https://api.bitget.com/api/v2/express/otc/advertList", params=params, ttl=10)
-        offers = data.get("data", [])
-        if not offers:
-            return None
-        best = offers[0]
         meta = P2P_EXCHANGES[self.exchange_id]
-        return P2POffer(
-            self.exchange_id,
-            meta.name,
-            float(best.get("price", 0)),
-            best.get("payMethods", []),
-            float(best.get("minTradeAmount", 0)),
-            float(best.get("maxTradeAmount", 0)),
-            None,
-            None,
-            datetime.now(timezone.utc),
-        )
+        offers = []
+        for item in data.get("data") or []:
+            offers.append(
+                P2POffer(
+                    self.exchange_id,
+                    meta.name,
+                    float(item.get("price", 0)),
+                    item.get("payMethods", []),
+                    float(item.get("minTradeAmount", 0)),
+                    float(item.get("maxTradeAmount", 0)),
+                    None,
+                    None,
+                    datetime.now(timezone.utc),
+                    fiat,
+                )
+            )
+        return offers
 
 
 def build_p2p_adapters() -> list[P2PAdapter]:
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+from src.adapters.base import PriceAdapter
+from src.adapters.cex import build_cex_adapters
+from src.config import DEFAULT_ORDER_SIZE_USD, MAX_REQUESTS_PER_HOST
+from src.http import HttpClient
+from src.models import PriceQuote
+
+
+FetchResult = Union[PriceQuote, BaseException]
+
+
+def load_venue_config(path: Optional[str]) -> Tuple[Dict[str, Dict[str, Any]], List[str]]:
+    # {"cex": {"<id>": {"name": ..., "url": ..., "price": "<field.path>", ...}}, "disable": ["<id>"]}
+    # An explicitly named file that is missing fails loudly, since silently
+    # ignoring it would re-enable venues the operator meant to disable.
+    if not path:
+        return {}, []
+    with open(path, encoding="utf-8") as handle:
+        data = json.load(handle)
+    return dict(data.get("cex", {})), list(data.get("disable", []))
+
+
+class AdapterRegistry:
+    def __init__(self, adapters: List[PriceAdapter], max_per_host: int = MAX_REQUESTS_PER_HOST) -> None:
+        self.adapters = adapters
+        self.max_per_host = max_per_host
+        self.groups: Dict[str, List[PriceAdapter]] = {}
+        for adapter in adapters:
+            self.groups.setdefault(urlsplit(adapter.endpoint).netloc, []).append(adapter)
+        for group in self.groups.values():
+            # Venues on the same endpoint sit together so they collapse onto one
+            # shared in-flight request in HttpClient.
+            group.sort(key=lambda adapter: adapter.endpoint)
+
+    async def _fetch_group(self, client: HttpClient, group: List[PriceAdapter]) -> List[FetchResult]:
+        semaphore = asyncio.Semaphore(self.max_per_host)
+
+        async def fetch(adapter: PriceAdapter) -> PriceQuote:
+            async with semaphore:
+                return await adapter.fetch(client)
+
+        return await asyncio.gather(*[fetch(adapter) for adapter in group], return_exceptions=True)
+
+    async def fetch_all(self, client: HttpClient) -> List[Tuple[PriceAdapter, FetchResult]]:
+        groups = list(self.groups.values())
+        results = await asyncio.gather(*[self._fetch_group(client, group) for group in groups])
+        by_adapter = {
+            id(adapter): result for group, group_results in zip(groups, results) for adapter, result in zip(group, group_results)
+        }
+        return [(adapter, by_adapter[id(adapter)]) for adapter in self.adapters]
+
+
+def build_registry(
+    order_size: float = DEFAULT_ORDER_SIZE_USD,
+    jupiter_mode: str = "spot",
+    venues_file: Optional[str] = None,
+    disabled: Iterable[str] = (),
+) -> AdapterRegistry:
+    extra, file_disabled = load_venue_config(venues_file)
+    skip = set(disabled) | set(file_disabled)
+    adapters = build_cex_adapters(extra, skip)
+    from src.adapters.dex import build_dex_adapters
+
+    adapters += [adapter for adapter in build_dex_adapters(jupiter_mode, order_size) if adapter.exchange_id not in skip]
+    return AdapterRegistry(adapters)
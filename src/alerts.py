@@ -0,0 +1,278 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+import aiohttp
+
+from src.config import ALERT_QUEUE_SIZE, ALERT_REFERENCE_EPSILON_BPS, ALERT_SINK_TIMEOUT_SECONDS
+from src.models import P2POffer, PriceQuote
+
+
+ALERT_KINDS = ("deviation", "p2p_discount", "venue_down")
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class AlertRule:
+    name: str
+    kind: str
+    threshold: float
+    # Hysteresis: an active alert only resolves once the value drops below this.
+    clear_threshold: Optional[float] = None
+    venues: FrozenSet[str] = frozenset()
+    # Consecutive breaching evaluations required before the alert fires.
+    debounce: int = 1
+
+    @property
+    def clear_below(self) -> float:
+        if self.clear_threshold is not None:
+            return self.clear_threshold
+        if self.kind == "venue_down":
+            return 1
+        return self.threshold * 0.8
+
+
+@dataclass
+class Alert:
+    rule: str
+    venue: str
+    state: str
+    value: float
+    threshold: float
+    message: str
+    at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+    def to_json(self) -> str:
+        payload = asdict(self)
+        payload["at"] = self.at.isoformat()
+        return json.dumps(payload)
+
+
+@dataclass
+class RuleState:
+    breaches: int = 0
+    active: bool = False
+    # Last evaluated value, replayed on cycles where nothing was recomputed.
+    value: Optional[float] = None
+    message: str = ""
+
+
+def parse_rule(spec: str) -> AlertRule:
+    # kind:threshold[:debounce][@venue,venue]
+    spec, _, venues = spec.partition("@")
+    parts = spec.split(":")
+    if parts[0] not in ALERT_KINDS or len(parts) not in (2, 3):
+        raise ValueError(f"Invalid alert rule: {spec}")
+    return AlertRule(
+        name=f"{parts[0]}:{parts[1]}" + (f"@{venues}" if venues else ""),
+        kind=parts[0],
+        threshold=float(parts[1]),
+        venues=frozenset(venue.strip() for venue in venues.split(",") if venue.strip()),
+        debounce=int(parts[2]) if len(parts) == 3 else 1,
+    )
+
+
+class WebhookSink:
+    def __init__(self, url: str) -> None:
+        self.url = url
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def send(self, alert: Alert) -> None:
+        if self._session is None:
+            self._session = aiohttp.ClientSession()
+        async with self._session.post(
+            self.url,
+            data=alert.to_json(),
+            headers={"Content-Type": "application/json"},
+            timeout=ALERT_SINK_TIMEOUT_SECONDS,
+        ) as response:
+            response.raise_for_status()
+
+    async def close(self) -> None:
+        if self._session:
+            await self._session.close()
+
+
+class UnixSocketSink:
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    async def send(self, alert: Alert) -> None:
+        _, writer = await asyncio.open_unix_connection(self.path)
+        try:
+            writer.write(alert.to_json().encode() + b"\n")
+            await writer.drain()
+        finally:
+            writer.close()
+            await writer.wait_closed()
+
+    async def close(self) -> None:
+        return None
+
+
+class AlertEngine:
+    def __init__(
+        self,
+        rules: Sequence[AlertRule],
+        sinks: Sequence[WebhookSink | UnixSocketSink],
+        queue_size: int = ALERT_QUEUE_SIZE,
+    ) -> None:
+        self.rules = list(rules)
+        self.sinks = list(sinks)
+        self.dropped = 0
+        # Rules are indexed by venue so an update only touches that venue's rules.
+        self._venue_rules: Dict[str, List[AlertRule]] = {}
+        self._wildcard_rules: List[AlertRule] = []
+        for rule in self.rules:
+            if rule.kind == "p2p_discount":
+                continue
+            if rule.venues:
+                for venue in rule.venues:
+                    self._venue_rules.setdefault(venue, []).append(rule)
+            else:
+                self._wildcard_rules.append(rule)
+        self._p2p_rules = [rule for rule in self.rules if rule.kind == "p2p_discount"]
+        self._states: Dict[Tuple[str, str], RuleState] = {}
+        self._last_prices: Dict[str, float] = {}
+        self._failures: Dict[str, int] = {}
+        self._last_reference: Optional[float] = None
+        self._last_p2p: Optional[Tuple[float, float]] = None
+        # Each sink drains its own bounded queue so one slow sink delays neither
+        # fetching nor the other sinks.
+        self._queues: List[asyncio.Queue[Alert]] = [asyncio.Queue(maxsize=queue_size) for _ in self.sinks]
+        self._workers: List[asyncio.Task] = []
+
+    def start(self) -> None:
+        if not self._workers:
+            self._workers = [
+                asyncio.create_task(self._deliver(sink, sink_queue)) for sink, sink_queue in zip(self.sinks, self._queues)
+            ]
+
+    async def stop(self) -> None:
+        if self._workers:
+            try:
+                await asyncio.wait_for(
+                    asyncio.gather(*[sink_queue.join() for sink_queue in self._queues]), ALERT_SINK_TIMEOUT_SECONDS
+                )
+            except asyncio.TimeoutError:
+                pass
+            for worker in self._workers:
+                worker.cancel()
+            self._workers = []
+        for sink in self.sinks:
+            await sink.close()
+
+    async def _deliver(self, sink: WebhookSink | UnixSocketSink, sink_queue: asyncio.Queue[Alert]) -> None:
+        while True:
+            alert = await sink_queue.get()
+            try:
+                await asyncio.wait_for(sink.send(alert), ALERT_SINK_TIMEOUT_SECONDS)
+            except Exception as exc:
+                logger.warning("Alert delivery to %s failed: %r", type(sink).__name__, exc)
+            finally:
+                sink_queue.task_done()
+
+    def _emit(self, alert: Alert) -> None:
+        # When a sink falls behind, its oldest undelivered alert is dropped.
+        for sink_queue in self._queues:
+            if sink_queue.full():
+                sink_queue.get_nowait()
+                sink_queue.task_done()
+                self.dropped += 1
+            sink_queue.put_nowait(alert)
+
+    def _evaluate(self, rule: AlertRule, venue: str, value: float, message: str) -> Optional[Alert]:
+        state = self._states.setdefault((rule.name, venue), RuleState())
+        state.value = value
+        state.message = message
+        alert = None
+        if value >= rule.threshold:
+            state.breaches += 1
+            if not state.active and state.breaches >= rule.debounce:
+                state.active = True
+                alert = Alert(rule.name, venue, "firing", value, rule.threshold, message)
+        elif value < rule.clear_below:
+            state.breaches = 0
+            if state.active:
+                state.active = False
+                alert = Alert(rule.name, venue, "resolved", value, rule.threshold, message)
+        elif not state.active:
+            state.breaches = 0
+        if alert:
+            self._emit(alert)
+        return alert
+
+    def _replay(self, rules: List[AlertRule], venue: str) -> List[Alert]:
+        # Debounce counts cycles, so a value that has not changed still counts
+        # towards (or against) its rule each cycle without being recomputed.
+        alerts = []
+        for rule in rules:
+            state = self._states.get((rule.name, venue))
+            if state is None or state.value is None:
+                continue
+            alert = self._evaluate(rule, venue, state.value, state.message)
+            if alert:
+                alerts.append(alert)
+        return alerts
+
+    def on_quote(self, quote: PriceQuote, reference: Optional[float]) -> List[Alert]:
+        venue = quote.exchange_id
+        failed = quote.price_usd <= 0
+        self._failures[venue] = self._failures.get(venue, 0) + 1 if failed else 0
+        alerts = []
+        for rule in self._venue_rules.get(venue, []) + self._wildcard_rules:
+            alert = None
+            if rule.kind == "venue_down":
+                failures = self._failures[venue]
+                alert = self._evaluate(rule, venue, failures, f"{quote.exchange_name} down for {failures} cycles")
+            elif rule.kind == "deviation" and reference and not failed:
+                deviation = abs(quote.price_usd - reference) / reference * 10000
+                alert = self._evaluate(
+                    rule, venue, deviation, f"{quote.exchange_name} deviates {deviation:.0f} bps from reference"
+                )
+            if alert:
+                alerts.append(alert)
+        return alerts
+
+    def on_cycle(self, quotes: List[PriceQuote], best_p2p: Optional[P2POffer], reference: Optional[float]) -> List[Alert]:
+        reference_moved = (
+            reference is not None
+            and self._last_reference is not None
+            and abs(reference - self._last_reference) / self._last_reference * 10000 > ALERT_REFERENCE_EPSILON_BPS
+        )
+        if reference_moved or self._last_reference is None:
+            self._last_reference = reference
+        alerts: List[Alert] = []
+        for quote in quotes:
+            venue = quote.exchange_id
+            changed = self._last_prices.get(venue) != quote.price_usd
+            # Failing venues are re-evaluated every cycle so their down-count advances.
+            if changed or reference_moved or quote.price_usd <= 0:
+                self._last_prices[venue] = quote.price_usd
+                alerts.extend(self.on_quote(quote, self._last_reference))
+            else:
+                alerts.extend(self._replay(self._venue_rules.get(venue, []) + self._wildcard_rules, venue))
+        cex_prices = [quote.price_usd for quote in quotes if quote.kind == "CEX" and quote.price_usd > 0]
+        if self._p2p_rules and best_p2p and best_p2p.price_usd and cex_prices:
+            current = (min(cex_prices), best_p2p.price_usd)
+            if current != self._last_p2p:
+                self._last_p2p = current
+                discount = (current[0] - current[1]) / current[0] * 10000
+                for rule in self._p2p_rules:
+                    alert = self._evaluate(
+                        rule,
+                        "p2p",
+                        discount,
+                        f"{best_p2p.exchange_name} P2P beats best CEX by {discount:.0f} bps",
+                    )
+                    if alert:
+                        alerts.append(alert)
+            else:
+                alerts.extend(self._replay(self._p2p_rules, "p2p"))
+        return alerts
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List, Optional
+
+
+def time_command(command: List[str], runs: int) -> List[float]:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def report(label: str, timings: List[float]) -> None:
+    print(f"{label:<28} median {statistics.median(timings):7.3f}s  min {min(timings):7.3f}s  runs {len(timings)}")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Measure startup and one-shot wall time.")
+    parser.add_argument("--runs", type=int, default=5, help="Repetitions per measurement")
+    parser.add_argument("--imports-only", action="store_true", help="Skip the networked --once runs")
+    args = parser.parse_args(argv)
+
+    report("import src.main", time_command([sys.executable, "-c", "import src.main"], args.runs))
+    report("--help", time_command([sys.executable, "-m", "src.main", "--help"], args.runs))
+    if args.imports_only:
+        return
+    once = [sys.executable, "-m", "src.main", "--once"]
+    report("--once (cold)", time_command(once, args.runs))
+    with tempfile.TemporaryDirectory() as cache_dir:
+        # First run populates the cache; only the warm runs are reported.
+        time_command(once + ["--cache-dir", cache_dir], 1)
+        report("--once (warm cache)", time_command(once + ["--cache-dir", cache_dir], args.runs))
+
+
+if __name__ == "__main__":
+    main()
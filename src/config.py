@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict
+from typing import Any, Dict
 
 
 @dataclass(frozen=True)
@@ -11,32 +11,103 @@ class ExchangeMeta:
     chain: str
     source: str
     fee_bps: float
+    quote_currency: str = "USD"
 
 
 CEX_EXCHANGES: Dict[str, ExchangeMeta] = {
-    "binance": ExchangeMeta("Binance", "CEX", "Solana", "REST", 10),
-    "gate": ExchangeMeta("Gate", "CEX", "Solana", "REST", 20),
-    "bybit": ExchangeMeta("Bybit", "CEX", "Solana", "REST", 10),
-    "okx": ExchangeMeta("OKX", "CEX", "Solana", "REST", 8),
-    "bitget": ExchangeMeta("Bitget", "CEX", "Solana", "REST", 10),
+    "binance": ExchangeMeta("Binance", "CEX", "Solana", "REST", 10, "USDT"),
+    "gate": ExchangeMeta("Gate", "CEX", "Solana", "REST", 20, "USDT"),
+    "bybit": ExchangeMeta("Bybit", "CEX", "Solana", "REST", 10, "USDT"),
+    "okx": ExchangeMeta("OKX", "CEX", "Solana", "REST", 8, "USDT"),
+    "bitget": ExchangeMeta("Bitget", "CEX", "Solana", "REST", 10, "USDT"),
     "coinbase": ExchangeMeta("Coinbase Exchange", "CEX", "Solana", "REST", 50),
-    "upbit": ExchangeMeta("Upbit", "CEX", "Solana", "REST", 5),
-    "kucoin": ExchangeMeta("KuCoin", "CEX", "Solana", "REST", 10),
-    "mexc": ExchangeMeta("MEXC", "CEX", "Solana", "REST", 10),
-    "htx": ExchangeMeta("HTX", "CEX", "Solana", "REST", 20),
+    "upbit": ExchangeMeta("Upbit", "CEX", "Solana", "REST", 5, "USDT"),
+    "kucoin": ExchangeMeta("KuCoin", "CEX", "Solana", "REST", 10, "USDT"),
+    "mexc": ExchangeMeta("MEXC", "CEX", "Solana", "REST", 10, "USDT"),
+    "htx": ExchangeMeta("HTX", "CEX", "Solana", "REST", 20, "USDT"),
+}
+
+# Declarative CEX ticker endpoints. Field paths are dotted keys / list indices into
+# the JSON response; time fields are epoch milliseconds unless time_format is "iso".
+CEX_ENDPOINTS: Dict[str, Dict[str, Any]] = {
+    "binance": {
+        "url": "https://api.binance.com/api/v3/ticker/24hr",
+        "params": {"symbol": "SOLUSDT"},
+        "price": "lastPrice",
+        "source_time": "closeTime",
+    },
+    "gate": {
+        "url": "https://api.gateio.ws/api/v4/spot/tickers",
+        "params": {"currency_pair": "SOL_USDT"},
+        "price": "0.last",
+        "liquidity": "0.quote_volume",
+    },
+    "bybit": {
+        "url": "https://api.bybit.com/v5/market/tickers",
+        "params": {"category": "spot", "symbol": "SOLUSDT"},
+        "price": "result.list.0.lastPrice",
+        "liquidity": "result.list.0.turnover24h",
+        "source_time": "time",
+    },
+    "okx": {
+        "url": "https://www.okx.com/api/v5/market/ticker",
+        "params": {"instId": "SOL-USDT"},
+        "price": "data.0.last",
+        "liquidity": "data.0.volCcy24h",
+        "source_time": "data.0.ts",
+    },
+    "bitget": {
+        "url": "https://api.bitget.com/api/v2/spot/market/tickers",
+        "params": {"symbol": "SOLUSDT"},
+        "price": "data.0.lastPr",
+        "liquidity": "data.0.quoteVol",
+        "source_time": "data.0.ts",
+    },
+    "coinbase": {
+        "url": "https://api.exchange.coinbase.com/products/SOL-USD/ticker",
+        "price": "price",
+        "source_time": "time",
+        "time_format": "iso",
+    },
+    "upbit": {
+        "url": "https://api.upbit.com/v1/ticker",
+        "params": {"markets": "USDT-SOL"},
+        "price": "0.trade_price",
+        "liquidity": "0.acc_trade_price_24h",
+        "source_time": "0.timestamp",
+    },
+    "kucoin": {
+        "url": "https://api.kucoin.com/api/v1/market/orderbook/level1",
+        "params": {"symbol": "SOL-USDT"},
+        "price": "data.price",
+        "liquidity": "data.volValue",
+        "source_time": "data.time",
+    },
+    "mexc": {
+        "url": "https://api.mexc.com/api/v3/ticker/price",
+        "params": {"symbol": "SOLUSDT"},
+        "price": "price",
+    },
+    "htx": {
+        "url": "https://api.huobi.pro/market/trade",
+        "params": {"symbol": "solusdt"},
+        "price": "tick.data.0.price",
+        "liquidity": "tick.amount",
+        "source_time": "tick.data.0.ts",
+    },
 }
 
 DEX_EXCHANGES: Dict[str, ExchangeMeta] = {
-    "raydium": ExchangeMeta("Raydium", "DEX", "Solana", "DexScreener", 30),
-    "orca": ExchangeMeta("Orca", "DEX", "Solana", "DexScreener", 30),
-    "jupiter": ExchangeMeta("Jupiter Aggregator", "DEX", "Solana", "Jupiter", 30),
-    "meteora": ExchangeMeta("Meteora", "DEX", "Solana", "DexScreener", 30),
-    "openbook": ExchangeMeta("OpenBook", "DEX", "Solana", "DexScreener", 20),
-    "lifinity": ExchangeMeta("Lifinity", "DEX", "Solana", "DexScreener", 30),
-    "saber": ExchangeMeta("Saber", "DEX", "Solana", "DexScreener", 20),
-    "aldrin": ExchangeMeta("Aldrin", "DEX", "Solana", "DexScreener", 20),
-    "saros": ExchangeMeta("Saros", "DEX", "Solana", "DexScreener", 20),
-    "pumpfun": ExchangeMeta("Pump.fun / PumpSwap", "DEX", "Solana", "DexScreener", 50),
+    "raydium": ExchangeMeta("Raydium", "DEX", "Solana", "DexScreener", 30, "USDC"),
+    "orca": ExchangeMeta("Orca", "DEX", "Solana", "DexScreener", 30, "USDC"),
+    "jupiter": ExchangeMeta("Jupiter Aggregator", "DEX", "Solana", "Jupiter", 30, "USDC"),
+    "meteora": ExchangeMeta("Meteora", "DEX", "Solana", "DexScreener", 30, "USDC"),
+    "openbook": ExchangeMeta("OpenBook", "DEX", "Solana", "DexScreener", 20, "USDC"),
+    "lifinity": ExchangeMeta("Lifinity", "DEX", "Solana", "DexScreener", 30, "USDC"),
+    "saber": ExchangeMeta("Saber", "DEX", "Solana", "DexScreener", 20, "USDC"),
+    "aldrin": ExchangeMeta("Aldrin", "DEX", "Solana", "DexScreener", 20, "USDC"),
+    "saros": ExchangeMeta("Saros", "DEX", "Solana", "DexScreener", 20, "USDC"),
+    "pumpfun": ExchangeMeta("Pump.fun / PumpSwap", "DEX", "Solana", "DexScreener", 50, "USDC"),
 }
 
 P2P_EXCHANGES: Dict[str, ExchangeMeta] = {
@@ -51,3 +122,39 @@ REFERENCE_EXCHANGES = ["binance", "coinbase"]
 
 DEFAULT_REFRESH_SECONDS = 15
 DEFAULT_ORDER_SIZE_USD = 1000
+
+P2P_SIDE = "buy"
+DEFAULT_P2P_FIATS = ["USD"]
+DEFAULT_P2P_TICKETS: Dict[str, float] = {"USD": 500, "EUR": 500, "INR": 40000, "PKR": 140000}
+P2P_PAGE_SIZE = 10
+P2P_MAX_PAGES = 5
+P2P_PAGES_PER_ROUND = 3
+P2P_BOOK_TTL_SECONDS = 10
+
+CACHE_DIR_ENV = "SOL_AGG_CACHE_DIR"
+DISK_CACHE_RETENTION_SECONDS = 24 * 3600
+PAIR_METADATA_TTL_SECONDS = 6 * 3600
+
+JUPITER_MODES = ("spot", "route")
+JUPITER_MIN_BUCKET_USD = 10
+JUPITER_BUCKET_RATIO = 2 ** 0.5
+JUPITER_SLIPPAGE_BPS = 50
+
+FX_RATES_URL = "https://api.coinbase.com/v2/exchange-rates"
+FX_TTL_SECONDS = 60
+
+EXPORT_FORMATS = ("ndjson", "csv", "parquet")
+EXPORT_BATCH_SIZE = 500
+EXPORT_FLUSH_SECONDS = 30
+EXPORT_ROTATE_SECONDS = 3600
+
+DEFAULT_ALERT_RULES = ["deviation:200:2", "venue_down:3"]
+ALERT_QUEUE_SIZE = 100
+ALERT_SINK_TIMEOUT_SECONDS = 5
+ALERT_REFERENCE_EPSILON_BPS = 1
+
+VENUES_FILE_ENV = "SOL_AGG_VENUES_FILE"
+MAX_REQUESTS_PER_HOST = 4
+
+STREAM_KEYFRAME_INTERVAL = 30
+STREAM_MAX_CLIENT_BUFFER_BYTES = 1 << 20
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import time
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from src.config import DISK_CACHE_RETENTION_SECONDS
+
+
+@dataclass
+class StoredResponse:
+    payload: Any
+    expires_at: float
+    received_at: float
+    etag: Optional[str]
+    last_modified: Optional[str]
+
+
+class PersistentCache:
+    def __init__(self, cache_dir: str) -> None:
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, "http_cache.sqlite3")
+        self._db = sqlite3.connect(self.path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, payload TEXT NOT NULL, expires_at REAL NOT NULL, "
+            "received_at REAL NOT NULL, etag TEXT, last_modified TEXT)"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS metadata (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self.prune()
+
+    def prune(self) -> None:
+        now = time.time()
+        # Expired responses are kept for a while so their validators can still revalidate.
+        self._db.execute("DELETE FROM responses WHERE expires_at < ?", (now - DISK_CACHE_RETENTION_SECONDS,))
+        self._db.execute("DELETE FROM metadata WHERE expires_at < ?", (now,))
+        self._db.commit()
+
+    def get_response(self, key: str) -> Optional[StoredResponse]:
+        row = self._db.execute(
+            "SELECT payload, expires_at, received_at, etag, last_modified FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if not row:
+            return None
+        return StoredResponse(json.loads(row[0]), row[1], row[2], row[3], row[4])
+
+    def set_response(
+        self,
+        key: str,
+        payload: Any,
+        ttl: float,
+        received_at: float,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        self._db.execute(
+            "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+            (key, json.dumps(payload, separators=(",", ":")), time.time() + ttl, received_at, etag, last_modified),
+        )
+        self._db.commit()
+
+    def get_metadata(self, key: str) -> Optional[Any]:
+        row = self._db.execute("SELECT value, expires_at FROM metadata WHERE key = ?", (key,)).fetchone()
+        if not row or row[1] < time.time():
+            return None
+        return json.loads(row[0])
+
+    def set_metadata(self, key: str, value: Any, ttl: float) -> None:
+        self._db.execute(
+            "INSERT OR REPLACE INTO metadata VALUES (?, ?, ?)",
+            (key, json.dumps(value), time.time() + ttl),
+        )
+        self._db.commit()
+
+    def close(self) -> None:
+        self._db.close()
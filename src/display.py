@@ -1,12 +1,17 @@
 from __future__ import annotations
 
+import math
 from datetime import datetime
-from typing import List
+from typing import TYPE_CHECKING, Dict, List, Optional
 
 from rich.console import Console
 from rich.table import Table
 
-from src.models import P2POffer, PriceQuote, RankingResult
+from src.metrics import Histogram, LatencyMetrics, TransferStats
+from src.models import P2POffer, P2PQuote, PriceQuote, RankingResult
+
+if TYPE_CHECKING:
+    from src.what_if import WhatIfResult
 
 
 console = Console()
@@ -23,6 +28,7 @@ def render_quotes(quotes: List[PriceQuote], top5_ids: List[str]) -> None:
     table.add_column("Type")
     table.add_column("Chain")
     table.add_column("SOL Price (USD)", justify="right")
+    table.add_column("Quote")
     table.add_column("Source")
     table.add_column("Liquidity", justify="right")
     table.add_column("Last Updated")
@@ -36,6 +42,7 @@ def render_quotes(quotes: List[PriceQuote], top5_ids: List[str]) -> None:
             quote.kind,
             quote.chain,
             f"${quote.price_usd:,.4f}",
+            quote.quote_currency,
             quote.source,
             liquidity,
             format_time(quote.last_updated),
@@ -56,38 +63,119 @@ def render_top5(top5: List[PriceQuote]) -> None:
     console.print(table)
 
 
-def render_p2p(best: P2POffer | None, offers: List[P2POffer]) -> None:
-    if not best:
+def render_p2p(best: P2POffer | None, quotes: List[P2PQuote]) -> None:
+    if best:
+        console.print(
+            f"[bold green]Best P2P Buy Rate:[/bold green] {best.exchange_name} ({best.fiat}) at ${best.price_usd:,.4f}"
+        )
+    if not quotes:
         console.print("[yellow]No P2P offers available.[/yellow]")
         return
-    console.print(
-        f"[bold green]Best P2P Buy Rate:[/bold green] {best.exchange_name} at ${best.price_usd:,.4f}"
-    )
-    table = Table(title="P2P Cheapest Offers")
+    table = Table(title="P2P Effective Rates")
     table.add_column("Exchange")
-    table.add_column("Price")
+    table.add_column("Fiat")
+    table.add_column("Ticket", justify="right")
+    table.add_column("Effective Rate", justify="right")
+    table.add_column("USD Rate", justify="right")
+    table.add_column("Ads Used", justify="right")
     table.add_column("Payment Methods")
     table.add_column("Min")
     table.add_column("Max")
-    table.add_column("Region")
-    for offer in offers:
+    for quote in quotes:
+        offer = quote.best_offer
         table.add_row(
-            offer.exchange_name,
-            f"${offer.price_usd:,.4f}",
-            ", ".join(offer.payment_methods) if offer.payment_methods else "N/A",
-            f"${offer.min_limit:,.2f}" if offer.min_limit else "N/A",
-            f"${offer.max_limit:,.2f}" if offer.max_limit else "N/A",
-            offer.region or "N/A",
+            quote.exchange_name,
+            quote.fiat,
+            f"{quote.amount:,.2f}",
+            f"{quote.effective_price:,.4f}" if quote.effective_price else "N/A",
+            f"${quote.effective_price_usd:,.4f}" if quote.effective_price_usd else "N/A",
+            f"{quote.offers_used}/{quote.offers_seen}",
+            ", ".join(offer.payment_methods) if offer and offer.payment_methods else "N/A",
+            f"{offer.min_limit:,.2f}" if offer and offer.min_limit else "N/A",
+            f"{offer.max_limit:,.2f}" if offer and offer.max_limit else "N/A",
         )
     console.print(table)
 
 
-def render_summary(result: RankingResult, rpc_slot: int | None = None) -> None:
+def render_what_if(result: WhatIfResult) -> None:
+    table = Table(title="Cheapest Venue by Order Size")
+    table.add_column("Order Size", justify="right")
+    for tier in result.fee_tiers:
+        table.add_column(f"{tier}")
+    for size_index, size in enumerate(result.order_sizes):
+        cells = []
+        for tier_index in range(len(result.fee_tiers)):
+            venue_index = int(result.best_index[size_index, tier_index])
+            price = result.effective_prices[venue_index, size_index, tier_index]
+            cells.append(f"{result.venues[venue_index]} ${price:,.4f}" if math.isfinite(price) else "N/A")
+        table.add_row(f"${size:,.0f}", *cells)
+    console.print(table)
+    for crossover in result.crossovers:
+        console.print(
+            f"[{crossover.fee_tier}] {crossover.from_venue} -> {crossover.to_venue} "
+            f"between ${crossover.lower_size:,.0f} and ${crossover.upper_size:,.0f}"
+        )
+
+
+def render_summary(result: RankingResult, rpc_slot: int | None = None, rates: Optional[Dict[str, float]] = None) -> None:
     if result.reference_price:
         console.print(f"USD Reference Price (Binance + Coinbase): ${result.reference_price:,.4f}")
     if result.average_price:
         console.print(f"Global Average SOL Price: ${result.average_price:,.4f}")
     if rpc_slot:
         console.print(f"Solana RPC Slot: {rpc_slot}")
+    if rates:
+        stable = [f"{currency}/USD {rates[currency]:.4f}" for currency in ("USDT", "USDC") if currency in rates]
+        if stable:
+            console.print("Stablecoin Rates: " + "  ".join(stable))
     if result.slippage_warning:
         console.print(f"[yellow]{result.slippage_warning}[/yellow]")
+
+
+def format_quantile(histogram: Histogram, q: float, fmt: str) -> str:
+    value = histogram.quantile(q)
+    return fmt.format(value) if value is not None else "N/A"
+
+
+def render_latency(metrics: LatencyMetrics) -> None:
+    if not metrics.request_latency_ms:
+        return
+    table = Table(title="Request Latency")
+    table.add_column("Host")
+    table.add_column("Samples", justify="right")
+    table.add_column("p50", justify="right")
+    table.add_column("p95", justify="right")
+    table.add_column("Max", justify="right")
+    table.add_column("304s", justify="right")
+    table.add_column("Wire", justify="right")
+    table.add_column("Decoded", justify="right")
+    for host in metrics.hosts():
+        histogram = metrics.request_latency_ms[host]
+        transfer = metrics.transfer.get(host, TransferStats())
+        table.add_row(
+            host,
+            str(histogram.count),
+            format_quantile(histogram, 0.5, "{:,.0f} ms"),
+            format_quantile(histogram, 0.95, "{:,.0f} ms"),
+            f"{histogram.max:,.0f} ms",
+            str(transfer.not_modified),
+            f"{transfer.wire_bytes / 1024:,.1f} KiB",
+            f"{transfer.decoded_bytes / 1024:,.1f} KiB",
+        )
+    console.print(table)
+    if not metrics.clock_skew_seconds:
+        return
+    table = Table(title="Source Clock Skew (receive - event time)")
+    table.add_column("Exchange")
+    table.add_column("Samples", justify="right")
+    table.add_column("Mean", justify="right")
+    table.add_column("p95", justify="right")
+    for exchange_id in sorted(metrics.clock_skew_seconds):
+        histogram = metrics.clock_skew_seconds[exchange_id]
+        table.add_row(
+            exchange_id,
+            str(histogram.count),
+            f"{histogram.mean:+.2f}s",
+            format_quantile(histogram, 0.95, "{:+.2f}s"),
+        )
+    console.print(table)
@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import csv
+import importlib.util
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from src.config import EXPORT_BATCH_SIZE, EXPORT_FLUSH_SECONDS, EXPORT_FORMATS, EXPORT_ROTATE_SECONDS
+from src.models import P2POffer, PriceQuote
+
+
+QUOTE_COLUMNS = (
+    "cycle_at",
+    "exchange_id",
+    "kind",
+    "price_usd",
+    "native_price",
+    "quote_currency",
+    "liquidity_usd",
+    "fee_bps",
+    "price_impact",
+    "source_time",
+    "received_at",
+    "latency_ms",
+    "warnings",
+)
+OFFER_COLUMNS = (
+    "cycle_at",
+    "exchange_id",
+    "fiat",
+    "price",
+    "min_limit",
+    "max_limit",
+    "payment_methods",
+    "completion_rate",
+    "order_count",
+    "last_updated",
+)
+
+logger = logging.getLogger(__name__)
+
+
+def quote_row(cycle_at: datetime, quote: PriceQuote) -> Tuple[Any, ...]:
+    return (
+        cycle_at,
+        quote.exchange_id,
+        quote.kind,
+        quote.price_usd,
+        quote.native_price,
+        quote.quote_currency,
+        quote.liquidity_usd,
+        quote.fee_bps,
+        quote.price_impact,
+        quote.source_time,
+        quote.received_at,
+        quote.latency_ms,
+        "; ".join(quote.warnings),
+    )
+
+
+def offer_row(cycle_at: datetime, offer: P2POffer) -> Tuple[Any, ...]:
+    return (
+        cycle_at,
+        offer.exchange_id,
+        offer.fiat,
+        offer.price,
+        offer.min_limit,
+        offer.max_limit,
+        ", ".join(method for method in offer.payment_methods if method),
+        offer.completion_rate,
+        offer.order_count,
+        offer.last_updated,
+    )
+
+
+def to_text(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+class ColumnBatch:
+    def __init__(self, columns: Sequence[str]) -> None:
+        self.names = list(columns)
+        self.columns: List[List[Any]] = [[] for _ in self.names]
+
+    def __len__(self) -> int:
+        return len(self.columns[0])
+
+    def append(self, row: Tuple[Any, ...]) -> None:
+        for column, value in zip(self.columns, row):
+            column.append(value)
+
+    def rows(self) -> List[Tuple[Any, ...]]:
+        return list(zip(*self.columns))
+
+
+class BatchWriter:
+    def __init__(self, directory: str, fmt: str, rotate_seconds: int) -> None:
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format: {fmt}")
+        # Fail at startup rather than on the writer thread.
+        if fmt == "parquet" and importlib.util.find_spec("pyarrow") is None:
+            raise ValueError("Parquet export requires pyarrow (pip install pyarrow)")
+        self.directory = directory
+        self.fmt = fmt
+        self.rotate_seconds = rotate_seconds
+        self._sequence = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, table: str, suffix: str) -> str:
+        window = int(time.time() // self.rotate_seconds) * self.rotate_seconds
+        stamp = datetime.fromtimestamp(window, tz=timezone.utc).strftime("%Y%m%dT%H%M%S")
+        return os.path.join(self.directory, f"{table}-{stamp}{suffix}")
+
+    def write(self, table: str, batch: ColumnBatch) -> None:
+        if self.fmt == "ndjson":
+            with open(self._path(table, ".ndjson"), "a", encoding="utf-8") as handle:
+                for row in batch.rows():
+                    handle.write(json.dumps(dict(zip(batch.names, map(to_text, row)))) + "\n")
+        elif self.fmt == "csv":
+            path = self._path(table, ".csv")
+            is_new = not os.path.exists(path)
+            with open(path, "a", encoding="utf-8", newline="") as handle:
+                writer = csv.writer(handle)
+                if is_new:
+                    writer.writerow(batch.names)
+                writer.writerows([tuple(map(to_text, row)) for row in batch.rows()])
+        else:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            # Parquet files cannot be appended to, so each batch is its own file.
+            self._sequence += 1
+            table_data = pa.table(dict(zip(batch.names, batch.columns)))
+            pq.write_table(table_data, self._path(table, f"-{self._sequence:06d}.parquet"))
+
+
+class SnapshotExporter:
+    def __init__(
+        self,
+        directory: str,
+        fmt: str = "ndjson",
+        batch_size: int = EXPORT_BATCH_SIZE,
+        flush_seconds: float = EXPORT_FLUSH_SECONDS,
+        rotate_seconds: int = EXPORT_ROTATE_SECONDS,
+    ) -> None:
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self._writer = BatchWriter(directory, fmt, rotate_seconds)
+        self._batches: Dict[str, ColumnBatch] = {
+            "quotes": ColumnBatch(QUOTE_COLUMNS),
+            "p2p_offers": ColumnBatch(OFFER_COLUMNS),
+        }
+        self._last_flush = time.monotonic()
+        # File I/O and encoding happen on this thread so the fetch loop only pays
+        # for appending to in-memory columns.
+        self._queue: "queue.Queue[Optional[Tuple[str, ColumnBatch]]]" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="snapshot-exporter", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            table, batch = item
+            try:
+                self._writer.write(table, batch)
+            except Exception:
+                logger.exception("Failed to export %d %s rows", len(batch), table)
+
+    def record_cycle(self, quotes: List[PriceQuote], offers: List[P2POffer]) -> None:
+        cycle_at = datetime.now(timezone.utc)
+        for quote in quotes:
+            self._batches["quotes"].append(quote_row(cycle_at, quote))
+        for offer in offers:
+            self._batches["p2p_offers"].append(offer_row(cycle_at, offer))
+        due = time.monotonic() - self._last_flush >= self.flush_seconds
+        self.flush(force=due)
+
+    def flush(self, force: bool = True) -> None:
+        for table, batch in self._batches.items():
+            if len(batch) and (force or len(batch) >= self.batch_size):
+                self._queue.put((table, batch))
+                self._batches[table] = ColumnBatch(batch.names)
+        if force:
+            self._last_flush = time.monotonic()
+
+    def close(self) -> None:
+        self.flush()
+        self._queue.put(None)
+        self._thread.join()
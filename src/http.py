@@ -1,12 +1,45 @@
 from __future__ import annotations
 
 import asyncio
+import dataclasses
+import gzip
+import json
 import time
+import zlib
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlsplit
 
 import aiohttp
 
+from src.disk_cache import PersistentCache
+from src.metrics import LatencyMetrics
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional at runtime
+    brotli = None
+
+
+ACCEPT_ENCODING = "gzip, deflate, br" if brotli else "gzip, deflate"
+
+
+def decode_body(body: bytes, content_encoding: str) -> bytes:
+    encoding = content_encoding.strip().lower()
+    if encoding in ("", "identity"):
+        return body
+    if encoding == "gzip":
+        return gzip.decompress(body)
+    if encoding == "deflate":
+        try:
+            return zlib.decompress(body)
+        except zlib.error:
+            return zlib.decompress(body, -zlib.MAX_WBITS)
+    if encoding == "br" and brotli:
+        return brotli.decompress(body)
+    raise ValueError(f"Unsupported content encoding: {content_encoding}")
+
 
 @dataclass
 class CacheEntry:
@@ -14,6 +47,25 @@ class CacheEntry:
     expires_at: float
 
 
+@dataclass(frozen=True)
+class ResponseTiming:
+    sent_monotonic: float
+    received_monotonic: float
+    received_at: datetime
+    from_cache: bool = False
+
+    @property
+    def latency_ms(self) -> float:
+        return (self.received_monotonic - self.sent_monotonic) * 1000
+
+
+@dataclass
+class Validator:
+    etag: Optional[str]
+    last_modified: Optional[str]
+    payload: Any
+
+
 class SimpleCache:
     def __init__(self) -> None:
         self._entries: Dict[str, CacheEntry] = {}
@@ -27,7 +79,7 @@ class SimpleCache:
             return None
         return entry.value
 
-    def set(self, key: str, value: Any, ttl: int) -> None:
+    def set(self, key: str, value: Any, ttl: float) -> None:
         self._entries[key] = CacheEntry(value=value, expires_at=time.time() + ttl)
 
 
@@ -47,48 +99,126 @@ class RateLimiter:
 
 
 class HttpClient:
-    def __init__(self) -> None:
-        self._session = aiohttp.ClientSession()
+    def __init__(self, cache_dir: Optional[str] = None) -> None:
+        # Decompression is done by hand so wire and decoded sizes can be counted.
+        self._session = aiohttp.ClientSession(auto_decompress=False)
         self._cache = SimpleCache()
+        self._metadata = SimpleCache()
+        self._disk = PersistentCache(cache_dir) if cache_dir else None
+        self._validators: Dict[str, Validator] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
         self._rate_limiter = RateLimiter(rate_per_second=5)
+        self.metrics = LatencyMetrics()
 
     async def get_json(self, url: str, params: Optional[Dict[str, Any]] = None, ttl: int = 5) -> Any:
-        cache_key = f"GET:{url}:{params}"
-        cached = self._cache.get(cache_key)
-        if cached is not None:
-            return cached
-        await self._rate_limiter.throttle()
-        for attempt in range(3):
-            try:
-                async with self._session.get(url, params=params, timeout=10) as response:
-                    response.raise_for_status()
-                    payload = await response.json()
-                    self._cache.set(cache_key, payload, ttl)
-                    return payload
-            except Exception:
-                if attempt == 2:
-                    raise
-                await asyncio.sleep(0.5 * (attempt + 1))
-        raise RuntimeError("Unreachable")
+        payload, _ = await self.get_json_timed(url, params=params, ttl=ttl)
+        return payload
+
+    async def get_json_timed(
+        self, url: str, params: Optional[Dict[str, Any]] = None, ttl: int = 5
+    ) -> Tuple[Any, ResponseTiming]:
+        return await self._request_json("GET", url, f"GET:{url}:{params}", ttl, params=params)
 
     async def post_json(self, url: str, payload: Dict[str, Any], ttl: int = 5) -> Any:
-        cache_key = f"POST:{url}:{payload}"
+        data, _ = await self.post_json_timed(url, payload, ttl=ttl)
+        return data
+
+    async def post_json_timed(self, url: str, payload: Dict[str, Any], ttl: int = 5) -> Tuple[Any, ResponseTiming]:
+        return await self._request_json("POST", url, f"POST:{url}:{payload}", ttl, json=payload)
+
+    async def _request_json(self, method: str, url: str, cache_key: str, ttl: int, **kwargs: Any) -> Tuple[Any, ResponseTiming]:
         cached = self._cache.get(cache_key)
         if cached is not None:
-            return cached
+            payload, timing = cached
+            return payload, dataclasses.replace(timing, from_cache=True)
+        # Concurrent callers for the same request share one in-flight fetch.
+        pending = self._inflight.get(cache_key)
+        if pending is not None:
+            payload, timing = await asyncio.shield(pending)
+            return payload, dataclasses.replace(timing, from_cache=True)
+        task = asyncio.ensure_future(self._fetch_json(method, url, cache_key, ttl, **kwargs))
+        self._inflight[cache_key] = task
+        try:
+            return await asyncio.shield(task)
+        finally:
+            if self._inflight.get(cache_key) is task:
+                del self._inflight[cache_key]
+
+    async def _fetch_json(self, method: str, url: str, cache_key: str, ttl: int, **kwargs: Any) -> Tuple[Any, ResponseTiming]:
+        validator = self._validators.get(cache_key)
+        if self._disk:
+            stored = self._disk.get_response(cache_key)
+            if stored:
+                timing = ResponseTiming(0.0, 0.0, datetime.fromtimestamp(stored.received_at, tz=timezone.utc), True)
+                remaining = stored.expires_at - time.time()
+                if remaining > 0:
+                    self._cache.set(cache_key, (stored.payload, timing), remaining)
+                    return stored.payload, timing
+                if validator is None and (stored.etag or stored.last_modified):
+                    validator = Validator(stored.etag, stored.last_modified, stored.payload)
+                    self._validators[cache_key] = validator
         await self._rate_limiter.throttle()
+        headers = {"Accept-Encoding": ACCEPT_ENCODING}
+        if validator:
+            if validator.etag:
+                headers["If-None-Match"] = validator.etag
+            if validator.last_modified:
+                headers["If-Modified-Since"] = validator.last_modified
+        host = urlsplit(url).netloc
         for attempt in range(3):
             try:
-                async with self._session.post(url, json=payload, timeout=10) as response:
-                    response.raise_for_status()
-                    data = await response.json()
-                    self._cache.set(cache_key, data, ttl)
-                    return data
+                sent = time.monotonic()
+                async with self._session.request(method, url, headers=headers, timeout=10, **kwargs) as response:
+                    if response.status == 304 and validator:
+                        payload = validator.payload
+                        timing = self._record_timing(url, sent)
+                        self.metrics.record_transfer(host, 0, 0, not_modified=True)
+                    else:
+                        response.raise_for_status()
+                        body = await response.read()
+                        decoded = decode_body(body, response.headers.get("Content-Encoding", ""))
+                        payload = json.loads(decoded)
+                        timing = self._record_timing(url, sent)
+                        self.metrics.record_transfer(host, len(body), len(decoded))
+                        etag = response.headers.get("ETag")
+                        last_modified = response.headers.get("Last-Modified")
+                        validator = Validator(etag, last_modified, payload) if etag or last_modified else None
+                        if validator:
+                            self._validators[cache_key] = validator
+                    self._cache.set(cache_key, (payload, timing), ttl)
+                    if self._disk:
+                        self._disk.set_response(
+                            cache_key,
+                            payload,
+                            ttl,
+                            timing.received_at.timestamp(),
+                            validator.etag if validator else None,
+                            validator.last_modified if validator else None,
+                        )
+                    return payload, timing
             except Exception:
                 if attempt == 2:
                     raise
                 await asyncio.sleep(0.5 * (attempt + 1))
         raise RuntimeError("Unreachable")
 
+    def get_metadata(self, key: str) -> Optional[Any]:
+        value = self._metadata.get(key)
+        if value is None and self._disk:
+            value = self._disk.get_metadata(key)
+        return value
+
+    def set_metadata(self, key: str, value: Any, ttl: float) -> None:
+        self._metadata.set(key, value, ttl)
+        if self._disk:
+            self._disk.set_metadata(key, value, ttl)
+
+    def _record_timing(self, url: str, sent: float) -> ResponseTiming:
+        timing = ResponseTiming(sent, time.monotonic(), datetime.now(timezone.utc))
+        self.metrics.record_latency(urlsplit(url).netloc, timing.latency_ms)
+        return timing
+
     async def close(self) -> None:
         await self._session.close()
+        if self._disk:
+            self._disk.close()
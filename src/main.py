@@ -2,89 +2,133 @@ from __future__ import annotations
 
 import argparse
 import asyncio
+import dataclasses
+import math
+import os
 from datetime import datetime, timezone
-from typing import List
-
-from src.adapters.cex import (
-    BinanceAdapter,
-    BitgetAdapter,
-    BybitAdapter,
-    CoinbaseAdapter,
-    GateAdapter,
-    HtxAdapter,
-    KuCoinAdapter,
-    MexcAdapter,
-    OkxAdapter,
-    UpbitAdapter,
+from typing import TYPE_CHECKING, Dict, List, Mapping, Optional, Sequence
+
+from src.adapters.registry import AdapterRegistry, build_registry
+from src.config import (
+    CACHE_DIR_ENV,
+    DEFAULT_ALERT_RULES,
+    DEFAULT_ORDER_SIZE_USD,
+    DEFAULT_P2P_FIATS,
+    DEFAULT_REFRESH_SECONDS,
+    EXPORT_BATCH_SIZE,
+    EXPORT_FLUSH_SECONDS,
+    EXPORT_FORMATS,
+    JUPITER_MODES,
+    STREAM_KEYFRAME_INTERVAL,
+    VENUES_FILE_ENV,
 )
-from src.adapters.dex import build_dex_adapters
-from src.adapters.p2p import build_p2p_adapters
-from src.config import CEX_EXCHANGES, DEX_EXCHANGES, DEFAULT_ORDER_SIZE_USD, DEFAULT_REFRESH_SECONDS
-from src.display import render_p2p, render_quotes, render_summary, render_top5
 from src.http import HttpClient
-from src.models import P2POffer, PriceQuote
-from src.normalizer import apply_staleness
+from src.models import P2PQuote, PriceQuote
+from src.normalizer import apply_staleness, fetch_usd_rates, normalize_p2p, normalize_quotes, record_clock_skew
 from src.ranking import build_ranking_result
 from src.solana_rpc import SolanaRpc
 
-
-def build_cex_adapters() -> list:
-    return [
-        BinanceAdapter("binance"),
-        GateAdapter("gate"),
-        BybitAdapter("bybit"),
-        OkxAdapter("okx"),
-        BitgetAdapter("bitget"),
-        CoinbaseAdapter("coinbase"),
-        UpbitAdapter("upbit"),
-        KuCoinAdapter("kucoin"),
-        MexcAdapter("mexc"),
-        HtxAdapter("htx"),
-    ]
+if TYPE_CHECKING:
+    from src.alerts import AlertEngine
+    from src.export import SnapshotExporter
+    from src.p2p_engine import P2PEngine
+    from src.stream import SnapshotStream
+    from src.what_if import WhatIfResult
 
 
-async def fetch_prices(client: HttpClient) -> List[PriceQuote]:
-    adapters = build_cex_adapters() + build_dex_adapters()
-    tasks = [adapter.fetch(client) for adapter in adapters]
+async def fetch_prices(client: HttpClient, registry: AdapterRegistry) -> List[PriceQuote]:
     quotes: List[PriceQuote] = []
-    results = await asyncio.gather(*tasks, return_exceptions=True)
-    for adapter, result in zip(adapters, results):
-        if isinstance(result, Exception):
-            meta = CEX_EXCHANGES.get(adapter.exchange_id) or DEX_EXCHANGES.get(adapter.exchange_id)
-            if meta:
-                quote = PriceQuote(
-                    adapter.exchange_id,
-                    meta.name,
-                    meta.kind,
-                    meta.chain,
-                    0.0,
-                    meta.source,
-                    None,
-                    datetime.now(timezone.utc),
-                    meta.fee_bps,
-                    [f"Fetch error: {result}"],
-                )
-                quotes.append(quote)
+    for adapter, result in await registry.fetch_all(client):
+        if isinstance(result, BaseException):
+            meta = adapter.meta
+            quote = PriceQuote(
+                adapter.exchange_id,
+                meta.name,
+                meta.kind,
+                meta.chain,
+                0.0,
+                meta.source,
+                None,
+                datetime.now(timezone.utc),
+                meta.fee_bps,
+                [f"Fetch error: {result}"],
+            )
+            quotes.append(quote)
             continue
         quotes.append(result)
+    record_clock_skew(quotes, client.metrics)
     return apply_staleness(quotes)
 
 
-async def fetch_p2p(client: HttpClient) -> List[P2POffer]:
-    adapters = build_p2p_adapters()
-    tasks = [adapter.fetch_best_offer(client) for adapter in adapters]
-    offers: List[P2POffer] = []
-    results = await asyncio.gather(*tasks, return_exceptions=True)
-    for result in results:
-        if isinstance(result, Exception) or result is None:
-            continue
-        offers.append(result)
-    return offers
+async def fetch_p2p(client: HttpClient, engine: Optional[P2PEngine]) -> List[P2PQuote]:
+    if engine is None:
+        return []
+    return await engine.fetch_quotes(client)
+
+
+async def fetch_rates(client: HttpClient) -> Dict[str, float]:
+    try:
+        return await fetch_usd_rates(client)
+    except Exception:
+        return {"USD": 1.0}
+
+
+def parse_tickets(values: List[str]) -> Dict[str, float]:
+    tickets = {}
+    for value in values:
+        fiat, _, amount = value.partition("=")
+        tickets[fiat.strip().upper()] = float(amount)
+    return tickets
+
 
+async def run_what_if(
+    client: HttpClient,
+    quotes: List[PriceQuote],
+    rates: Dict[str, float],
+    sizes: Sequence[float],
+    fee_tiers: Optional[Mapping[str, Mapping[str, float]]],
+    jupiter_mode: str,
+) -> WhatIfResult:
+    from src.adapters.dex import quote_ladder
+    from src.what_if import evaluate_grid
 
-async def run_once(client: HttpClient, order_size: float) -> None:
-    quotes = await fetch_prices(client)
-    p2p_offers = await fetch_p2p(client)
+    size_prices = {}
+    if jupiter_mode == "route":
+        try:
+            ladder = await quote_ladder(client, sizes)
+        except Exception:
+            ladder = {}
+        # Sizes whose bucket quotes failed are masked rather than filled with the
+        # order-size price, which was never quoted at those sizes.
+        usdc_rate = rates.get("USDC", 1.0)
+        size_prices["jupiter"] = [ladder[size].price * usdc_rate if size in ladder else math.nan for size in sizes]
+    return evaluate_grid(quotes, sizes, fee_tiers, size_prices)
+
+
+async def run_once(
+    client: HttpClient,
+    registry: AdapterRegistry,
+    order_size: float,
+    engine: Optional[P2PEngine],
+    jupiter_mode: str = "spot",
+    what_if_sizes: Optional[Sequence[float]] = None,
+    fee_tiers: Optional[Mapping[str, Mapping[str, float]]] = None,
+    exporter: Optional[SnapshotExporter] = None,
+    alerts: Optional[AlertEngine] = None,
+    stream: Optional[SnapshotStream] = None,
+) -> None:
+    rates, quotes, p2p_quotes = await asyncio.gather(
+        fetch_rates(client),
+        fetch_prices(client, registry),
+        fetch_p2p(client, engine),
+    )
+    quotes = normalize_quotes(quotes, rates)
+    p2p_quotes = normalize_p2p(p2p_quotes, rates)
+    p2p_offers = [
+        dataclasses.replace(quote.best_offer, price_usd=quote.effective_price_usd)
+        for quote in p2p_quotes
+        if quote.best_offer and quote.effective_price_usd
+    ]
     rpc_slot = None
     try:
         rpc_slot = await SolanaRpc().get_slot(client)
@@ -92,11 +136,31 @@ async def run_once(client: HttpClient, order_size: float) -> None:
         rpc_slot = None
     ranking = build_ranking_result(quotes, p2p_offers, order_size)
     ranking.quotes.sort(key=lambda quote: quote.price_usd)
+    if alerts:
+        alerts.on_cycle(ranking.quotes, ranking.best_p2p, ranking.reference_price)
+    if exporter:
+        offers = [offer for book in engine.last_books.values() for offer in book] if engine else []
+        exporter.record_cycle(ranking.quotes, offers)
+    if stream:
+        stream.publish(ranking)
+        if stream.captures_stdout:
+            return
+    # rich is only needed once there is something to render.
+    from src.display import render_latency, render_p2p, render_quotes, render_summary, render_top5, render_what_if
+
     top5_ids = [quote.exchange_id for quote in ranking.top5]
-    render_summary(ranking, rpc_slot)
+    render_summary(ranking, rpc_slot, rates)
     render_quotes(ranking.quotes, top5_ids)
     render_top5(ranking.top5)
-    render_p2p(ranking.best_p2p, p2p_offers)
+    render_p2p(ranking.best_p2p, p2p_quotes)
+    if what_if_sizes:
+        try:
+            what_if = await run_what_if(client, ranking.quotes, rates, what_if_sizes, fee_tiers, jupiter_mode)
+        except ValueError:
+            what_if = None
+        if what_if:
+            render_what_if(what_if)
+    render_latency(client.metrics)
 
 
 async def main() -> None:
@@ -104,17 +168,172 @@ async def main() -> None:
     parser.add_argument("--refresh", type=int, default=DEFAULT_REFRESH_SECONDS, help="Refresh interval in seconds")
     parser.add_argument("--once", action="store_true", help="Run a single refresh cycle")
     parser.add_argument("--order-size", type=float, default=DEFAULT_ORDER_SIZE_USD, help="Order size for slippage checks")
+    parser.add_argument("--fiats", default=",".join(DEFAULT_P2P_FIATS), help="Comma-separated P2P fiat currencies")
+    parser.add_argument(
+        "--p2p-ticket",
+        action="append",
+        default=[],
+        metavar="FIAT=AMOUNT",
+        help="P2P ticket size in fiat units (repeatable)",
+    )
+    parser.add_argument("--payment-method", action="append", default=[], help="Accepted P2P payment method (repeatable)")
+    parser.add_argument("--min-completion-rate", type=float, default=None, help="Minimum P2P merchant completion rate (0-1)")
+    parser.add_argument("--min-orders", type=int, default=None, help="Minimum P2P merchant completed orders")
+    parser.add_argument(
+        "--jupiter-mode",
+        choices=JUPITER_MODES,
+        default="spot",
+        help="Jupiter spot price, or a routed USDC->SOL quote at the order size",
+    )
+    parser.add_argument("--alert-webhook", action="append", default=[], help="POST alerts as JSON to this URL (repeatable)")
+    parser.add_argument("--alert-socket", action="append", default=[], help="Send alerts as NDJSON to this Unix socket (repeatable)")
+    parser.add_argument(
+        "--alert-rule",
+        action="append",
+        default=[],
+        metavar="KIND:THRESHOLD[:DEBOUNCE][@VENUES]",
+        help="deviation (bps), p2p_discount (bps) or venue_down (cycles); repeatable",
+    )
+    parser.add_argument(
+        "--venues-file",
+        default=os.getenv(VENUES_FILE_ENV),
+        help=f"JSON file adding, overriding or disabling venues (default: ${VENUES_FILE_ENV})",
+    )
+    parser.add_argument("--disable-venue", action="append", default=[], help="Skip this exchange id (repeatable)")
+    parser.add_argument(
+        "--stream",
+        default=None,
+        metavar="stdout|unix:PATH",
+        help="Publish a delta-encoded binary quote stream (stdout replaces the tables)",
+    )
+    parser.add_argument(
+        "--stream-keyframe-interval",
+        type=int,
+        default=STREAM_KEYFRAME_INTERVAL,
+        help="Cycles between full keyframes in the stream",
+    )
+    parser.add_argument("--no-p2p", action="store_true", help="Skip P2P marketplaces")
+    parser.add_argument(
+        "--what-if",
+        nargs="?",
+        const="",
+        default=None,
+        metavar="SIZES",
+        help="Rank venues across order sizes (comma-separated USD; default: log grid $100-$1M)",
+    )
+    parser.add_argument(
+        "--fee-tier",
+        action="append",
+        default=[],
+        metavar="LABEL:VENUE=BPS,...",
+        help="Extra fee tier for --what-if (repeatable)",
+    )
+    parser.add_argument("--export-dir", default=None, help="Write every cycle's quotes and P2P offers under this directory")
+    parser.add_argument("--export-format", choices=EXPORT_FORMATS, default="ndjson", help="Export file format")
+    parser.add_argument("--export-batch-size", type=int, default=EXPORT_BATCH_SIZE, help="Rows buffered before a write")
+    parser.add_argument(
+        "--export-flush-seconds",
+        type=float,
+        default=EXPORT_FLUSH_SECONDS,
+        help="Maximum seconds rows stay buffered",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=os.getenv(CACHE_DIR_ENV),
+        help=f"Persist responses and discovered pairs across runs (default: ${CACHE_DIR_ENV})",
+    )
     args = parser.parse_args()
 
-    client = HttpClient()
     try:
+        registry = build_registry(args.order_size, args.jupiter_mode, args.venues_file, args.disable_venue)
+    except (OSError, KeyError, ValueError) as exc:
+        parser.error(f"Cannot load venues file: {exc}")
+    engine = None
+    if not args.no_p2p:
+        from src.adapters.p2p import build_p2p_adapters
+        from src.p2p_engine import P2PEngine, P2PFilter
+
+        try:
+            engine = P2PEngine(
+                build_p2p_adapters(),
+                [fiat.strip().upper() for fiat in args.fiats.split(",") if fiat.strip()],
+                tickets=parse_tickets(args.p2p_ticket),
+                filters=P2PFilter(frozenset(args.payment_method), args.min_completion_rate, args.min_orders),
+            )
+        except ValueError as exc:
+            parser.error(str(exc))
+    what_if_sizes = None
+    fee_tiers = None
+    if args.what_if is not None:
+        from src.what_if import fee_tiers_from_args, log_size_grid
+
+        try:
+            sizes = [float(size) for size in args.what_if.split(",") if size.strip()]
+            fee_tiers = fee_tiers_from_args(args.fee_tier)
+        except ValueError as exc:
+            parser.error(f"Invalid --what-if or --fee-tier value: {exc}")
+        what_if_sizes = sizes or [float(size) for size in log_size_grid()]
+    stream = None
+    if args.stream:
+        from src.stream import SnapshotStream
+
+        try:
+            stream = SnapshotStream(args.stream, args.stream_keyframe_interval)
+        except ValueError as exc:
+            parser.error(str(exc))
+    alert_rules = []
+    if args.alert_webhook or args.alert_socket:
+        from src.alerts import parse_rule
+
+        try:
+            alert_rules = [parse_rule(spec) for spec in args.alert_rule or DEFAULT_ALERT_RULES]
+        except ValueError as exc:
+            parser.error(f"--alert-rule: {exc}")
+    exporter = None
+    if args.export_dir:
+        from src.export import SnapshotExporter
+
+        try:
+            exporter = SnapshotExporter(
+                args.export_dir, args.export_format, args.export_batch_size, args.export_flush_seconds
+            )
+        except (OSError, ValueError) as exc:
+            parser.error(f"Cannot export snapshots: {exc}")
+    alerts = None
+    if args.alert_webhook or args.alert_socket:
+        from src.alerts import AlertEngine, UnixSocketSink, WebhookSink
+
+        sinks = [WebhookSink(url) for url in args.alert_webhook] + [UnixSocketSink(path) for path in args.alert_socket]
+        alerts = AlertEngine(alert_rules, sinks)
+        alerts.start()
+    client = HttpClient(cache_dir=args.cache_dir)
+    try:
+        if stream:
+            await stream.start()
         while True:
-            await run_once(client, args.order_size)
+            await run_once(
+                client,
+                registry,
+                args.order_size,
+                engine,
+                args.jupiter_mode,
+                what_if_sizes,
+                fee_tiers,
+                exporter,
+                alerts,
+                stream,
+            )
             if args.once:
                 break
             await asyncio.sleep(args.refresh)
     finally:
         await client.close()
+        if exporter:
+            exporter.close()
+        if alerts:
+            await alerts.stop()
+        if stream:
+            await stream.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import bisect
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+SKEW_BUCKETS_SECONDS = (-5, -1, -0.25, 0, 0.25, 1, 2, 5, 10, 30, 60, 300)
+
+
+class Histogram:
+    def __init__(self, bounds: Sequence[float]) -> None:
+        self.bounds = list(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    @property
+    def mean(self) -> Optional[float]:
+        if not self.count:
+            return None
+        return self.total / self.count
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.count:
+            return None
+        target = q * self.count
+        cumulative = 0
+        for idx, bucket_count in enumerate(self.counts):
+            cumulative += bucket_count
+            if cumulative >= target and bucket_count:
+                upper = self.bounds[idx] if idx < len(self.bounds) else self.max
+                return min(upper, self.max)
+        return self.max
+
+
+@dataclass
+class TransferStats:
+    responses: int = 0
+    not_modified: int = 0
+    wire_bytes: int = 0
+    decoded_bytes: int = 0
+
+
+class LatencyMetrics:
+    def __init__(self) -> None:
+        self.request_latency_ms: Dict[str, Histogram] = {}
+        self.clock_skew_seconds: Dict[str, Histogram] = {}
+        self._last_skew_sample: Dict[str, datetime] = {}
+        self.transfer: Dict[str, TransferStats] = {}
+
+    def record_latency(self, host: str, latency_ms: float) -> None:
+        histogram = self.request_latency_ms.setdefault(host, Histogram(LATENCY_BUCKETS_MS))
+        histogram.observe(latency_ms)
+
+    def record_transfer(self, host: str, wire_bytes: int, decoded_bytes: int, not_modified: bool = False) -> None:
+        stats = self.transfer.setdefault(host, TransferStats())
+        stats.responses += 1
+        stats.not_modified += int(not_modified)
+        stats.wire_bytes += wire_bytes
+        stats.decoded_bytes += decoded_bytes
+
+    def record_clock_skew(self, exchange_id: str, source_time: datetime, received_at: datetime) -> None:
+        # Local receive time minus the exchange-provided event time: combines
+        # the venue's clock offset with how old the event was when served.
+        # Cached payloads replay the same receive time and are only counted once.
+        if self._last_skew_sample.get(exchange_id) == received_at:
+            return
+        self._last_skew_sample[exchange_id] = received_at
+        skew_seconds = (received_at - source_time).total_seconds()
+        histogram = self.clock_skew_seconds.setdefault(exchange_id, Histogram(SKEW_BUCKETS_SECONDS))
+        histogram.observe(skew_seconds)
+
+    def hosts(self) -> List[str]:
+        return sorted(self.request_latency_ms)
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 
 @dataclass
@@ -17,19 +17,45 @@ class PriceQuote:
     last_updated: datetime
     fee_bps: float
     warnings: List[str] = field(default_factory=list)
+    source_time: Optional[datetime] = None
+    received_at: Optional[datetime] = None
+    latency_ms: Optional[float] = None
+    # Set when price_usd already reflects execution at the order size (e.g. a routed quote).
+    price_impact: Optional[float] = None
+    quote_currency: str = "USD"
+    # Price in quote_currency before USD normalization.
+    native_price: Optional[float] = None
 
 
 @dataclass
 class P2POffer:
     exchange_id: str
     exchange_name: str
-    price_usd: float
+    # Quoted in `fiat` units; price_usd is only set once converted with FX rates.
+    price: float
     payment_methods: List[str]
     min_limit: Optional[float]
     max_limit: Optional[float]
     merchant_count: Optional[int]
     region: Optional[str]
     last_updated: datetime
+    fiat: str = "USD"
+    completion_rate: Optional[float] = None
+    order_count: Optional[int] = None
+    price_usd: Optional[float] = None
+
+
+@dataclass
+class P2PQuote:
+    exchange_id: str
+    exchange_name: str
+    fiat: str
+    amount: float
+    effective_price: Optional[float]
+    best_offer: Optional[P2POffer]
+    offers_used: int
+    offers_seen: int
+    effective_price_usd: Optional[float] = None
 
 
 @dataclass
@@ -40,3 +66,4 @@ class RankingResult:
     reference_price: Optional[float]
     best_p2p: Optional[P2POffer]
     slippage_warning: Optional[str]
+    effective_prices: Dict[str, float] = field(default_factory=dict)
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
 from datetime import datetime, timedelta, timezone
-from typing import List
+from typing import Dict, List
 
-from src.models import PriceQuote
+from src.config import FX_RATES_URL, FX_TTL_SECONDS
+from src.http import HttpClient
+from src.metrics import LatencyMetrics
+from src.models import P2PQuote, PriceQuote
 
 
 STALE_AFTER_SECONDS = 30
@@ -15,3 +18,43 @@ def apply_staleness(quotes: List[PriceQuote]) -> List[PriceQuote]:
         if now - quote.last_updated > timedelta(seconds=STALE_AFTER_SECONDS):
             quote.warnings.append("Stale data")
     return quotes
+
+
+def record_clock_skew(quotes: List[PriceQuote], metrics: LatencyMetrics) -> List[PriceQuote]:
+    for quote in quotes:
+        if quote.source_time and quote.received_at:
+            metrics.record_clock_skew(quote.exchange_id, quote.source_time, quote.received_at)
+    return quotes
+
+
+async def fetch_usd_rates(client: HttpClient) -> Dict[str, float]:
+    # One batch request covers every stablecoin and fiat; the HTTP cache shares it
+    # across the cycle.
+    data = await client.get_json(FX_RATES_URL, params={"currency": "USD"}, ttl=FX_TTL_SECONDS)
+    usd_rates = {"USD": 1.0}
+    for currency, value in data.get("data", {}).get("rates", {}).items():
+        per_usd = float(value)
+        if per_usd > 0:
+            # Coinbase quotes units of each currency per USD; invert to USD per unit.
+            usd_rates[currency.upper()] = 1 / per_usd
+    return usd_rates
+
+
+def normalize_quotes(quotes: List[PriceQuote], rates: Dict[str, float]) -> List[PriceQuote]:
+    pending = [quote for quote in quotes if quote.quote_currency != "USD" and quote.price_usd > 0]
+    factors = [rates.get(quote.quote_currency) for quote in pending]
+    for quote, factor in zip(pending, factors):
+        quote.native_price = quote.price_usd
+        if factor is None:
+            quote.warnings.append(f"{quote.quote_currency}/USD rate unavailable, assumed at par")
+            continue
+        quote.price_usd = quote.native_price * factor
+    return quotes
+
+
+def normalize_p2p(quotes: List[P2PQuote], rates: Dict[str, float]) -> List[P2PQuote]:
+    for quote in quotes:
+        factor = rates.get(quote.fiat)
+        if quote.effective_price is not None and factor is not None:
+            quote.effective_price_usd = quote.effective_price * factor
+    return quotes
@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+from src.adapters.base import P2PAdapter
+from src.config import (
+    DEFAULT_P2P_TICKETS,
+    P2P_BOOK_TTL_SECONDS,
+    P2P_EXCHANGES,
+    P2P_MAX_PAGES,
+    P2P_PAGE_SIZE,
+    P2P_PAGES_PER_ROUND,
+    P2P_SIDE,
+)
+from src.http import HttpClient, SimpleCache
+from src.models import P2POffer, P2PQuote
+
+
+@dataclass(frozen=True)
+class P2PFilter:
+    payment_methods: FrozenSet[str] = frozenset()
+    min_completion_rate: Optional[float] = None
+    min_order_count: Optional[int] = None
+
+    def accepts(self, offer: P2POffer) -> bool:
+        if offer.price <= 0:
+            return False
+        if self.payment_methods:
+            offered = {method.lower() for method in offer.payment_methods if method}
+            if not offered & {method.lower() for method in self.payment_methods}:
+                return False
+        if self.min_completion_rate is not None:
+            if offer.completion_rate is None or offer.completion_rate < self.min_completion_rate:
+                return False
+        if self.min_order_count is not None:
+            if offer.order_count is None or offer.order_count < self.min_order_count:
+                return False
+        return True
+
+
+def split_fill(
+    ranked: Sequence[P2POffer], amount: float, reserve_next: bool
+) -> Tuple[Optional[float], List[P2POffer]]:
+    remaining = amount
+    fiat_total = 0.0
+    asset_total = 0.0
+    used: List[P2POffer] = []
+    for index, offer in enumerate(ranked):
+        low = offer.min_limit or 0.0
+        fill = min(remaining, offer.max_limit or remaining)
+        if fill < low:
+            continue
+        if reserve_next and index + 1 < len(ranked):
+            # Filling to the max could leave less than the next ad's min limit;
+            # take less so that ad can still absorb the remainder.
+            next_min = ranked[index + 1].min_limit or 0.0
+            if 1e-9 < remaining - fill < next_min and remaining - next_min >= low:
+                fill = remaining - next_min
+        fiat_total += fill
+        asset_total += fill / offer.price
+        used.append(offer)
+        remaining -= fill
+        if remaining <= 1e-9:
+            return fiat_total / asset_total, used
+    return None, []
+
+
+def fill_amount(offers: Sequence[P2POffer], amount: float) -> Tuple[Optional[float], List[P2POffer]]:
+    # Walk the book cheapest-first, splitting the ticket across ads when a single
+    # ad's max limit is too small. Returns the volume-weighted rate and the ads used.
+    # Both walks are greedy, so the cheapest single ad covering the whole ticket
+    # is compared against them too.
+    ranked = sorted(offers, key=lambda item: item.price)
+    candidates = [split_fill(ranked, amount, False), split_fill(ranked, amount, True)]
+    for offer in ranked:
+        if (offer.min_limit or 0) <= amount <= (offer.max_limit or amount):
+            candidates.append((offer.price, [offer]))
+            break
+    filled = [candidate for candidate in candidates if candidate[0] is not None]
+    return min(filled, key=lambda candidate: candidate[0]) if filled else (None, [])
+
+
+class P2PEngine:
+    def __init__(
+        self,
+        adapters: List[P2PAdapter],
+        fiats: Sequence[str],
+        tickets: Optional[Dict[str, float]] = None,
+        filters: Optional[P2PFilter] = None,
+        side: str = P2P_SIDE,
+        page_size: int = P2P_PAGE_SIZE,
+        max_pages: int = P2P_MAX_PAGES,
+        pages_per_round: int = P2P_PAGES_PER_ROUND,
+    ) -> None:
+        self.adapters = adapters
+        self.fiats = list(fiats)
+        self.tickets = {**DEFAULT_P2P_TICKETS, **(tickets or {})}
+        missing = [fiat for fiat in self.fiats if fiat not in self.tickets]
+        if missing:
+            raise ValueError(f"No P2P ticket size for {', '.join(missing)}; pass --p2p-ticket FIAT=AMOUNT")
+        self.filters = filters or P2PFilter()
+        self.side = side
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.pages_per_round = pages_per_round
+        self._books = SimpleCache()
+        # Full paged books from the latest fetch_quotes call, keyed by (venue, fiat).
+        self.last_books: Dict[Tuple[str, str], List[P2POffer]] = {}
+
+    def ticket(self, fiat: str) -> float:
+        return self.tickets[fiat]
+
+    def _is_filled(self, offers: List[P2POffer], fiat: str) -> bool:
+        eligible = [offer for offer in offers if self.filters.accepts(offer)]
+        return fill_amount(eligible, self.ticket(fiat))[0] is not None
+
+    async def _fetch_venue(self, client: HttpClient, adapter: P2PAdapter) -> Dict[str, List[P2POffer]]:
+        books: Dict[str, List[P2POffer]] = {}
+        pending: List[str] = []
+        for fiat in self.fiats:
+            cached = self._books.get(f"{adapter.exchange_id}:{fiat}:{self.side}")
+            if cached is not None:
+                books[fiat] = cached
+            else:
+                books[fiat] = []
+                pending.append(fiat)
+        fetched = list(pending)
+        failed = set()
+        max_pages = min(adapter.max_pages or self.max_pages, self.max_pages)
+        next_page = 1
+        # Every pending fiat's next few pages go out in one concurrent round; a fiat
+        # drops out once its book is exhausted or the ticket can already be filled,
+        # since later pages only hold more expensive ads.
+        while pending and next_page <= max_pages:
+            pages = range(next_page, min(next_page + self.pages_per_round, max_pages + 1))
+            requests = [(fiat, page) for fiat in pending for page in pages]
+            results = await asyncio.gather(
+                *[adapter.fetch_page(client, fiat, self.side, page, self.page_size) for fiat, page in requests],
+                return_exceptions=True,
+            )
+            exhausted = set()
+            for (fiat, _), result in zip(requests, results):
+                if fiat in exhausted:
+                    continue
+                if isinstance(result, Exception):
+                    failed.add(fiat)
+                    exhausted.add(fiat)
+                    continue
+                books[fiat].extend(result)
+                if len(result) < self.page_size:
+                    exhausted.add(fiat)
+            next_page = pages.stop
+            pending = [fiat for fiat in pending if fiat not in exhausted and not self._is_filled(books[fiat], fiat)]
+        for fiat in fetched:
+            if fiat not in failed:
+                self._books.set(f"{adapter.exchange_id}:{fiat}:{self.side}", books[fiat], P2P_BOOK_TTL_SECONDS)
+        return books
+
+    async def fetch_books(self, client: HttpClient) -> Dict[Tuple[str, str], List[P2POffer]]:
+        results = await asyncio.gather(
+            *[self._fetch_venue(client, adapter) for adapter in self.adapters],
+            return_exceptions=True,
+        )
+        books: Dict[Tuple[str, str], List[P2POffer]] = {}
+        for adapter, result in zip(self.adapters, results):
+            if isinstance(result, Exception):
+                continue
+            for fiat, offers in result.items():
+                books[(adapter.exchange_id, fiat)] = offers
+        return books
+
+    def best_rates(self, books: Dict[Tuple[str, str], List[P2POffer]]) -> List[P2PQuote]:
+        quotes: List[P2PQuote] = []
+        for (exchange_id, fiat), offers in books.items():
+            amount = self.ticket(fiat)
+            eligible = [offer for offer in offers if self.filters.accepts(offer)]
+            price, used = fill_amount(eligible, amount)
+            quotes.append(
+                P2PQuote(
+                    exchange_id,
+                    P2P_EXCHANGES[exchange_id].name,
+                    fiat,
+                    amount,
+                    price,
+                    used[0] if used else None,
+                    len(used),
+                    len(offers),
+                )
+            )
+        quotes.sort(key=lambda quote: (quote.fiat, quote.effective_price is None, quote.effective_price or 0.0))
+        return quotes
+
+    async def fetch_quotes(self, client: HttpClient) -> List[P2PQuote]:
+        self.last_books = await self.fetch_books(client)
+        return self.best_rates(self.last_books)
@@ -25,6 +25,10 @@ def apply_liquidity_checks(quotes: List[PriceQuote], order_size: float) -> List[
     for quote in quotes:
         if quote.kind != "DEX":
             continue
+        if quote.price_impact is not None:
+            if quote.price_impact > 0.01:
+                quote.warnings.append(f"Price impact {quote.price_impact:.2%}")
+            continue
         if quote.liquidity_usd is None:
             quote.warnings.append("No liquidity data")
             continue
@@ -49,7 +53,7 @@ def rank_quotes(quotes: List[PriceQuote], order_size: float, reference: Optional
     for quote in quotes:
         fee_multiplier = 1 + (quote.fee_bps / 10000)
         slippage_cost = 0.0
-        if quote.kind == "DEX" and quote.liquidity_usd:
+        if quote.kind == "DEX" and quote.liquidity_usd and quote.price_impact is None:
             slippage_cost = min(order_size / max(quote.liquidity_usd, 1), 0.05) * quote.price_usd
         effective_price = quote.price_usd * fee_multiplier + slippage_cost
         ranked.append((quote, effective_price))
@@ -70,7 +74,8 @@ def build_ranking_result(
     ranked = rank_quotes(valid_quotes, order_size, reference_price)
     top5 = [item[0] for item in ranked[:5]]
 
-    best_p2p = min(p2p_offers, key=lambda offer: offer.price_usd) if p2p_offers else None
+    priced = [offer for offer in p2p_offers if offer.price_usd]
+    best_p2p = min(priced, key=lambda offer: offer.price_usd) if priced else None
 
     slippage_warning = None
     for quote in valid_quotes:
@@ -85,4 +90,5 @@ def build_ranking_result(
         reference_price=reference_price,
         best_p2p=best_p2p,
         slippage_warning=slippage_warning,
+        effective_prices={quote.exchange_id: price for quote, price in ranked},
     )
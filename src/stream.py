@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import struct
+import sys
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+from src.config import STREAM_KEYFRAME_INTERVAL, STREAM_MAX_CLIENT_BUFFER_BYTES
+from src.models import PriceQuote, RankingResult
+
+
+# Wire format: every frame is a little-endian u32 length prefix followed by
+#   header  = u8 frame type, u16 record count, u32 sequence, i64 timestamp (ms)
+#   VENUES  record = u16 venue id, u8 name length, utf-8 name
+#   KEY/DELTA record = u16 venue id, u8 field mask, then the masked fields in
+#   order: f64 price, f64 effective price, f64 liquidity (NaN if unknown), u16 flags
+# Catch-up keyframes sent to a newly connected consumer repeat the last sequence
+# number, so existing consumers never see a gap.
+FRAME_VENUES = 1
+FRAME_KEYFRAME = 2
+FRAME_DELTA = 3
+
+FIELD_PRICE = 1
+FIELD_EFFECTIVE = 2
+FIELD_LIQUIDITY = 4
+FIELD_FLAGS = 8
+ALL_FIELDS = FIELD_PRICE | FIELD_EFFECTIVE | FIELD_LIQUIDITY | FIELD_FLAGS
+
+FLAG_FETCH_ERROR = 1
+FLAG_STALE = 2
+FLAG_LOW_LIQUIDITY = 4
+FLAG_NO_LIQUIDITY_DATA = 8
+FLAG_PRICE_IMPACT = 16
+FLAG_ABNORMAL_SPREAD = 32
+FLAG_TOP5 = 64
+
+WARNING_FLAGS = (
+    ("Fetch error", FLAG_FETCH_ERROR),
+    ("Stale data", FLAG_STALE),
+    ("Low liquidity", FLAG_LOW_LIQUIDITY),
+    ("No liquidity data", FLAG_NO_LIQUIDITY_DATA),
+    ("Price impact", FLAG_PRICE_IMPACT),
+    ("Abnormal spread", FLAG_ABNORMAL_SPREAD),
+)
+
+LENGTH = struct.Struct("<I")
+HEADER = struct.Struct("<BHIq")
+RECORD_HEAD = struct.Struct("<HB")
+VENUE_HEAD = struct.Struct("<HB")
+FLOAT = struct.Struct("<d")
+FLAGS = struct.Struct("<H")
+
+VenueState = Tuple[float, float, float, int]
+
+
+def quote_flags(quote: PriceQuote, top5: Set[str]) -> int:
+    flags = FLAG_TOP5 if quote.exchange_id in top5 else 0
+    for warning in quote.warnings:
+        for prefix, flag in WARNING_FLAGS:
+            if warning.startswith(prefix):
+                flags |= flag
+    return flags
+
+
+def same_value(left: float, right: float) -> bool:
+    return left == right or (math.isnan(left) and math.isnan(right))
+
+
+class DeltaEncoder:
+    def __init__(self, keyframe_interval: int = STREAM_KEYFRAME_INTERVAL) -> None:
+        self.keyframe_interval = keyframe_interval
+        self.venue_ids: Dict[str, int] = {}
+        self._state: Dict[int, VenueState] = {}
+        self._sequence = 0
+        self._since_keyframe = 0
+
+    def _frame(self, frame_type: int, count: int, body: bytes, timestamp_ms: int, advance: bool = True) -> bytes:
+        if advance:
+            self._sequence = (self._sequence + 1) & 0xFFFFFFFF
+        payload = HEADER.pack(frame_type, count, self._sequence, timestamp_ms) + body
+        return LENGTH.pack(len(payload)) + payload
+
+    def _venue_frame(self, venues: List[Tuple[str, int]], timestamp_ms: int, advance: bool = True) -> bytes:
+        parts = []
+        for name, venue_id in venues:
+            encoded = name.encode()[:255]
+            parts.append(VENUE_HEAD.pack(venue_id, len(encoded)) + encoded)
+        return self._frame(FRAME_VENUES, len(venues), b"".join(parts), timestamp_ms, advance)
+
+    def _records(self, changes: List[Tuple[int, int, VenueState]]) -> bytes:
+        parts = []
+        for venue_id, mask, (price, effective, liquidity, flags) in changes:
+            parts.append(RECORD_HEAD.pack(venue_id, mask))
+            if mask & FIELD_PRICE:
+                parts.append(FLOAT.pack(price))
+            if mask & FIELD_EFFECTIVE:
+                parts.append(FLOAT.pack(effective))
+            if mask & FIELD_LIQUIDITY:
+                parts.append(FLOAT.pack(liquidity))
+            if mask & FIELD_FLAGS:
+                parts.append(FLAGS.pack(flags))
+        return b"".join(parts)
+
+    def keyframe(self, timestamp_ms: Optional[int] = None, advance: bool = True) -> List[bytes]:
+        # Venue table plus full state: what a newly connected consumer needs.
+        timestamp_ms = timestamp_ms if timestamp_ms is not None else int(time.time() * 1000)
+        changes = [(venue_id, ALL_FIELDS, state) for venue_id, state in sorted(self._state.items())]
+        return [
+            self._venue_frame(list(self.venue_ids.items()), timestamp_ms, advance),
+            self._frame(FRAME_KEYFRAME, len(changes), self._records(changes), timestamp_ms, advance),
+        ]
+
+    def encode(self, result: RankingResult) -> List[bytes]:
+        timestamp_ms = int(time.time() * 1000)
+        top5 = {quote.exchange_id for quote in result.top5}
+        frames: List[bytes] = []
+        new_venues = []
+        changes: List[Tuple[int, int, VenueState]] = []
+        for quote in result.quotes:
+            venue_id = self.venue_ids.get(quote.exchange_id)
+            if venue_id is None:
+                venue_id = self.venue_ids[quote.exchange_id] = len(self.venue_ids)
+                new_venues.append((quote.exchange_id, venue_id))
+            state = (
+                quote.price_usd,
+                result.effective_prices.get(quote.exchange_id, math.nan),
+                quote.liquidity_usd if quote.liquidity_usd is not None else math.nan,
+                quote_flags(quote, top5),
+            )
+            previous = self._state.get(venue_id)
+            mask = ALL_FIELDS
+            if previous is not None:
+                mask = 0
+                for bit, (old, new) in zip((FIELD_PRICE, FIELD_EFFECTIVE, FIELD_LIQUIDITY), zip(previous[:3], state[:3])):
+                    if not same_value(old, new):
+                        mask |= bit
+                if previous[3] != state[3]:
+                    mask |= FIELD_FLAGS
+            self._state[venue_id] = state
+            if mask:
+                changes.append((venue_id, mask, state))
+        self._since_keyframe += 1
+        if self._since_keyframe >= self.keyframe_interval or len(self._state) == len(new_venues):
+            self._since_keyframe = 0
+            return self.keyframe(timestamp_ms)
+        if new_venues:
+            frames.append(self._venue_frame(new_venues, timestamp_ms))
+        frames.append(self._frame(FRAME_DELTA, len(changes), self._records(changes), timestamp_ms))
+        return frames
+
+
+class DeltaDecoder:
+    def __init__(self) -> None:
+        self.venues: Dict[int, str] = {}
+        self.state: Dict[str, Dict[str, float]] = {}
+        self._buffer = b""
+
+    def feed(self, data: bytes) -> List[Tuple[int, int, Dict[str, Dict[str, float]]]]:
+        # Returns (frame type, timestamp ms, {venue: changed fields}) per complete frame.
+        self._buffer += data
+        frames = []
+        while len(self._buffer) >= LENGTH.size:
+            (length,) = LENGTH.unpack_from(self._buffer)
+            if len(self._buffer) < LENGTH.size + length:
+                break
+            payload = self._buffer[LENGTH.size : LENGTH.size + length]
+            self._buffer = self._buffer[LENGTH.size + length :]
+            frames.append(self._decode(payload))
+        return frames
+
+    def _decode(self, payload: bytes) -> Tuple[int, int, Dict[str, Dict[str, float]]]:
+        frame_type, count, _, timestamp_ms = HEADER.unpack_from(payload)
+        offset = HEADER.size
+        updates: Dict[str, Dict[str, float]] = {}
+        if frame_type == FRAME_VENUES:
+            for _ in range(count):
+                venue_id, length = VENUE_HEAD.unpack_from(payload, offset)
+                offset += VENUE_HEAD.size
+                self.venues[venue_id] = payload[offset : offset + length].decode()
+                offset += length
+            return frame_type, timestamp_ms, updates
+        for _ in range(count):
+            venue_id, mask = RECORD_HEAD.unpack_from(payload, offset)
+            offset += RECORD_HEAD.size
+            fields: Dict[str, float] = {}
+            for bit, name in ((FIELD_PRICE, "price"), (FIELD_EFFECTIVE, "effective_price"), (FIELD_LIQUIDITY, "liquidity")):
+                if mask & bit:
+                    (fields[name],) = FLOAT.unpack_from(payload, offset)
+                    offset += FLOAT.size
+            if mask & FIELD_FLAGS:
+                (fields["flags"],) = FLAGS.unpack_from(payload, offset)
+                offset += FLAGS.size
+            venue = self.venues.get(venue_id, str(venue_id))
+            self.state.setdefault(venue, {}).update(fields)
+            updates[venue] = fields
+        return frame_type, timestamp_ms, updates
+
+
+class SnapshotStream:
+    def __init__(self, target: str, keyframe_interval: int = STREAM_KEYFRAME_INTERVAL) -> None:
+        # target is "stdout" or "unix:<path>"
+        if target != "stdout" and not target.startswith("unix:"):
+            raise ValueError(f"Unsupported stream target: {target}")
+        self.target = target
+        self.encoder = DeltaEncoder(keyframe_interval)
+        self.captures_stdout = target == "stdout"
+        self._clients: Set[asyncio.StreamWriter] = set()
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> None:
+        if self.target.startswith("unix:"):
+            self._server = await asyncio.start_unix_server(self._on_connect, self.target[len("unix:") :])
+
+    async def _on_connect(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        if self.encoder.venue_ids:
+            writer.write(b"".join(self.encoder.keyframe(advance=False)))
+        self._clients.add(writer)
+
+    def publish(self, result: RankingResult) -> None:
+        data = b"".join(self.encoder.encode(result))
+        if self.captures_stdout:
+            sys.stdout.buffer.write(data)
+            sys.stdout.buffer.flush()
+            return
+        for writer in list(self._clients):
+            # Consumers that stop reading are dropped rather than allowed to
+            # back-pressure the fetch loop.
+            if writer.is_closing() or writer.transport.get_write_buffer_size() > STREAM_MAX_CLIENT_BUFFER_BYTES:
+                self._clients.discard(writer)
+                writer.close()
+                continue
+            writer.write(data)
+
+    async def close(self) -> None:
+        for writer in self._clients:
+            writer.close()
+        self._clients.clear()
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
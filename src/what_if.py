@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from src.models import PriceQuote
+
+
+MAX_SLIPPAGE = 0.05
+DEFAULT_FEE_TIER = "default"
+
+
+@dataclass
+class Crossover:
+    fee_tier: str
+    lower_size: float
+    upper_size: float
+    from_venue: str
+    to_venue: str
+
+
+@dataclass
+class WhatIfResult:
+    venues: List[str]
+    order_sizes: np.ndarray
+    fee_tiers: List[str]
+    # venues x order sizes x fee tiers
+    effective_prices: np.ndarray
+    # order sizes x fee tiers, indices into venues
+    best_index: np.ndarray
+    crossovers: List[Crossover]
+
+    def best_venue(self, size_index: int, tier_index: int = 0) -> str:
+        return self.venues[int(self.best_index[size_index, tier_index])]
+
+
+def log_size_grid(start: float = 100, stop: float = 1_000_000, points: int = 41) -> np.ndarray:
+    return np.geomspace(start, stop, points)
+
+
+def evaluate_grid(
+    quotes: List[PriceQuote],
+    order_sizes: Sequence[float],
+    fee_tiers: Optional[Mapping[str, Mapping[str, float]]] = None,
+    size_prices: Optional[Mapping[str, Sequence[float]]] = None,
+) -> WhatIfResult:
+    # fee_tiers maps a tier label to per-venue fee_bps overrides; size_prices gives
+    # venues with size-dependent pricing (e.g. a Jupiter quote ladder) one price per
+    # order size, already net of price impact; NaN marks a size with no quote.
+    valid = [quote for quote in quotes if quote.price_usd > 0]
+    if not valid:
+        raise ValueError("No priced quotes to evaluate")
+    tiers = dict(fee_tiers or {DEFAULT_FEE_TIER: {}})
+    size_prices = size_prices or {}
+    sizes = np.asarray(order_sizes, dtype=float)
+    venues = [quote.exchange_id for quote in valid]
+
+    prices = np.array([quote.price_usd for quote in valid])
+    liquidity = np.array([quote.liquidity_usd or 0.0 for quote in valid])
+    has_slippage = np.array(
+        [
+            quote.kind == "DEX" and bool(quote.liquidity_usd) and quote.price_impact is None
+            and quote.exchange_id not in size_prices
+            for quote in valid
+        ]
+    )
+    fees = np.array([[overrides.get(quote.exchange_id, quote.fee_bps) for overrides in tiers.values()] for quote in valid])
+
+    base = np.broadcast_to(prices[:, None], (len(valid), len(sizes))).copy()
+    for row, quote in enumerate(valid):
+        if quote.exchange_id in size_prices:
+            base[row] = np.asarray(size_prices[quote.exchange_id], dtype=float)
+    impact = np.where(
+        has_slippage[:, None],
+        np.minimum(sizes[None, :] / np.maximum(liquidity, 1)[:, None], MAX_SLIPPAGE),
+        0.0,
+    )
+    # Same model as rank_quotes: fee on the quoted price plus liquidity slippage.
+    effective = base[:, :, None] * (1 + fees[:, None, :] / 10000) + (impact * prices[:, None])[:, :, None]
+    # Unquoted cells can never be the cheapest venue.
+    effective = np.where(np.isnan(effective), np.inf, effective)
+    best = effective.argmin(axis=0)
+
+    crossovers: List[Crossover] = []
+    for tier_index, tier in enumerate(tiers):
+        column = best[:, tier_index]
+        for idx in np.flatnonzero(column[1:] != column[:-1]) + 1:
+            crossovers.append(
+                Crossover(tier, float(sizes[idx - 1]), float(sizes[idx]), venues[column[idx - 1]], venues[column[idx]])
+            )
+    return WhatIfResult(venues, sizes, list(tiers), effective, best, crossovers)
+
+
+def fee_tiers_from_args(values: Sequence[str]) -> Dict[str, Dict[str, float]]:
+    # "vip1:binance=7.5,okx=6" -> {"vip1": {"binance": 7.5, "okx": 6.0}}
+    tiers: Dict[str, Dict[str, float]] = {DEFAULT_FEE_TIER: {}}
+    for value in values:
+        label, _, spec = value.partition(":")
+        overrides = {}
+        for item in filter(None, spec.split(",")):
+            exchange_id, _, fee = item.partition("=")
+            overrides[exchange_id.strip()] = float(fee)
+        tiers[label.strip()] = overrides
+    return tiers
@@ -0,0 +1,84 @@
+import asyncio
+from datetime import datetime, timezone
+
+from aiohttp import web
+
+from src.alerts import Alert, AlertEngine, WebhookSink, parse_rule
+from src.models import PriceQuote
+
+
+def make_quote(price: float, exchange_id: str = "binance") -> PriceQuote:
+    return PriceQuote(exchange_id, exchange_id.title(), "CEX", "Solana", price, "REST", None, datetime.now(timezone.utc), 10)
+
+
+def states(alerts):
+    return [alert.state for alert in alerts]
+
+
+def test_debounce_counts_cycles_for_unchanged_price():
+    engine = AlertEngine([parse_rule("deviation:200:2")], [])
+    cycles = [engine.on_cycle([make_quote(105)], None, 100) for _ in range(5)]
+    assert [states(alerts) for alerts in cycles] == [[], ["firing"], [], [], []]
+
+
+def test_single_breach_below_debounce_does_not_fire():
+    engine = AlertEngine([parse_rule("deviation:200:2")], [])
+    assert engine.on_cycle([make_quote(105)], None, 100) == []
+    assert engine.on_cycle([make_quote(100.5)], None, 100) == []
+    assert engine.on_cycle([make_quote(105)], None, 100) == []
+
+
+def test_hysteresis_holds_until_clear_threshold():
+    engine = AlertEngine([parse_rule("deviation:200")], [])
+    assert states(engine.on_cycle([make_quote(103)], None, 100)) == ["firing"]
+    # 180 bps is below the threshold but above the default clear level (160 bps).
+    assert engine.on_cycle([make_quote(101.8)], None, 100) == []
+    assert states(engine.on_cycle([make_quote(101)], None, 100)) == ["resolved"]
+
+
+def test_venue_down_counts_consecutive_failures():
+    engine = AlertEngine([parse_rule("venue_down:3")], [])
+    results = [engine.on_cycle([make_quote(0.0)], None, 100) for _ in range(4)]
+    assert [states(alerts) for alerts in results] == [[], [], ["firing"], []]
+    assert results[2][0].value == 3
+    assert states(engine.on_cycle([make_quote(150)], None, 100)) == ["resolved"]
+
+
+def test_full_queue_drops_oldest_alert():
+    engine = AlertEngine([], [WebhookSink("http://127.0.0.1:1/")], queue_size=1)
+    first = Alert("rule", "binance", "firing", 1, 1, "first")
+    second = Alert("rule", "binance", "firing", 2, 1, "second")
+    engine._emit(first)
+    engine._emit(second)
+    assert engine.dropped == 1
+    assert engine._queues[0].get_nowait() is second
+
+
+def test_webhook_sink_delivers_alerts():
+    async def scenario():
+        received = []
+
+        async def handle(request):
+            received.append(await request.json())
+            return web.Response()
+
+        app = web.Application()
+        app.router.add_post("/hook", handle)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = runner.addresses[0][1]
+        engine = AlertEngine([parse_rule("deviation:200")], [WebhookSink(f"http://127.0.0.1:{port}/hook")])
+        engine.start()
+        try:
+            engine.on_cycle([make_quote(105)], None, 100)
+            await engine.stop()
+        finally:
+            await runner.cleanup()
+        return received
+
+    received = asyncio.run(scenario())
+    assert len(received) == 1
+    assert received[0]["state"] == "firing"
+    assert received[0]["venue"] == "binance"
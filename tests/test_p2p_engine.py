@@ -0,0 +1,105 @@
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+
+from src.adapters.base import P2PAdapter
+from src.models import P2POffer
+from src.p2p_engine import P2PEngine, P2PFilter, fill_amount
+
+
+def make_offer(price, min_limit=None, max_limit=None, methods=("Wise",), completion_rate=None, order_count=None):
+    return P2POffer(
+        "binance",
+        "Binance P2P",
+        price,
+        list(methods),
+        min_limit,
+        max_limit,
+        None,
+        None,
+        datetime.now(timezone.utc),
+        "USD",
+        completion_rate,
+        order_count,
+    )
+
+
+def test_single_ad_within_limits():
+    price, used = fill_amount([make_offer(100, 10, 1000)], 500)
+    assert price == 100
+    assert len(used) == 1
+
+
+def test_ticket_below_every_min_limit_is_unfillable():
+    assert fill_amount([make_offer(100, 600, 1000), make_offer(101, 700, 2000)], 500) == (None, [])
+
+
+def test_split_across_max_limits():
+    price, used = fill_amount([make_offer(100, 10, 200), make_offer(102, 10, 1000)], 500)
+    assert [offer.price for offer in used] == [100, 102]
+    assert price == pytest.approx(500 / (200 / 100 + 300 / 102))
+
+
+def test_partial_fill_keeps_remainder_above_next_min_limit():
+    offers = [make_offer(100, 10, 450), make_offer(101, 100, 300), make_offer(102, 100, 1000)]
+    price, used = fill_amount(offers, 500)
+    assert [offer.price for offer in used] == [100, 101]
+    assert price == pytest.approx(500 / (400 / 100 + 100 / 101))
+
+
+def test_cheap_ad_is_capped_to_leave_a_large_ad_its_min():
+    price, used = fill_amount([make_offer(100, 50, 200), make_offer(101, 400, 1000)], 500)
+    assert [offer.price for offer in used] == [100, 101]
+    assert price == pytest.approx(500 / (100 / 100 + 400 / 101))
+
+
+def test_ad_skipped_when_its_min_strands_the_rest():
+    price, used = fill_amount([make_offer(100, 200, 300), make_offer(101, 400, 1000)], 500)
+    assert [offer.price for offer in used] == [101]
+    assert price == 101
+
+
+def test_filters():
+    filters = P2PFilter(frozenset({"wise"}), min_completion_rate=0.9, min_order_count=50)
+    assert filters.accepts(make_offer(100, methods=("Wise",), completion_rate=0.95, order_count=80))
+    assert not filters.accepts(make_offer(100, methods=("Revolut",), completion_rate=0.95, order_count=80))
+    assert not filters.accepts(make_offer(100, methods=("Wise",), completion_rate=0.8, order_count=80))
+    assert not filters.accepts(make_offer(100, methods=("Wise",), completion_rate=0.95, order_count=10))
+    assert not filters.accepts(make_offer(100, methods=("Wise",), completion_rate=None, order_count=80))
+    assert not P2PFilter().accepts(make_offer(0))
+
+
+class PagedAdapter(P2PAdapter):
+    def __init__(self, pages):
+        super().__init__("binance")
+        self.pages = pages
+        self.requested = []
+
+    async def fetch_page(self, client, fiat, side, page, page_size):
+        self.requested.append(page)
+        return self.pages[page - 1] if page <= len(self.pages) else []
+
+
+def test_engine_stops_paging_once_ticket_fills():
+    filler = [make_offer(200, 10, 1000) for _ in range(8)]
+    pages = [[make_offer(100, 10, 450), make_offer(101, 100, 300)] + filler for _ in range(5)]
+    adapter = PagedAdapter(pages)
+    engine = P2PEngine([adapter], ["USD"], tickets={"USD": 500}, page_size=10, max_pages=5, pages_per_round=1)
+    quotes = asyncio.run(engine.fetch_quotes(None))
+    assert adapter.requested == [1]
+    assert quotes[0].effective_price == pytest.approx(500 / (400 / 100 + 100 / 101))
+    assert len(engine.last_books[("binance", "USD")]) == 10
+
+
+def test_engine_applies_filters_before_filling():
+    pages = [[make_offer(100, 10, 1000, methods=("Revolut",)), make_offer(105, 10, 1000, methods=("Wise",))]]
+    engine = P2PEngine([PagedAdapter(pages)], ["USD"], filters=P2PFilter(frozenset({"Wise"})))
+    quote = asyncio.run(engine.fetch_quotes(None))[0]
+    assert quote.effective_price == 105
+    assert quote.offers_seen == 2
+
+
+def test_engine_requires_ticket_for_unknown_fiat():
+    with pytest.raises(ValueError):
+        P2PEngine([], ["JPY"])
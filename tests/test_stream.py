@@ -0,0 +1,148 @@
+import asyncio
+import math
+from datetime import datetime, timezone
+
+from src.models import PriceQuote
+from src.ranking import build_ranking_result
+from src.stream import (
+    FRAME_DELTA,
+    FRAME_KEYFRAME,
+    FRAME_VENUES,
+    HEADER,
+    LENGTH,
+    DeltaDecoder,
+    DeltaEncoder,
+    SnapshotStream,
+)
+
+
+def make_quote(exchange_id, price, liquidity=None, kind="CEX"):
+    return PriceQuote(exchange_id, exchange_id.title(), kind, "Solana", price, "REST", liquidity, datetime.now(timezone.utc), 10)
+
+
+def ranking(*quotes):
+    return build_ranking_result(list(quotes), [], 1000)
+
+
+def headers(frames):
+    # (frame type, sequence) for each frame
+    result = []
+    for frame in frames:
+        (length,) = LENGTH.unpack_from(frame)
+        assert length == len(frame) - LENGTH.size
+        frame_type, _, sequence, _ = HEADER.unpack_from(frame, LENGTH.size)
+        result.append((frame_type, sequence))
+    return result
+
+
+def test_first_cycle_is_venue_table_and_keyframe():
+    encoder = DeltaEncoder(keyframe_interval=30)
+    decoder = DeltaDecoder()
+    frames = encoder.encode(ranking(make_quote("binance", 150.0), make_quote("orca", 151.0, 5e5, "DEX")))
+    assert headers(frames) == [(FRAME_VENUES, 1), (FRAME_KEYFRAME, 2)]
+    decoded = decoder.feed(b"".join(frames))
+    assert decoder.venues == {0: "binance", 1: "orca"}
+    assert decoded[1][2]["orca"]["liquidity"] == 5e5
+    assert decoder.state["binance"]["price"] == 150.0
+
+
+def test_delta_carries_only_changed_fields():
+    encoder = DeltaEncoder(keyframe_interval=30)
+    decoder = DeltaDecoder()
+    decoder.feed(b"".join(encoder.encode(ranking(make_quote("binance", 150.0), make_quote("okx", 152.0)))))
+    unchanged = decoder.feed(b"".join(encoder.encode(ranking(make_quote("binance", 150.0), make_quote("okx", 152.0)))))
+    assert [(frame_type, updates) for frame_type, _, updates in unchanged] == [(FRAME_DELTA, {})]
+    frames = encoder.encode(ranking(make_quote("binance", 150.5), make_quote("okx", 152.0)))
+    assert [frame_type for frame_type, _ in headers(frames)] == [FRAME_DELTA]
+    ((_, _, updates),) = decoder.feed(b"".join(frames))
+    assert set(updates) == {"binance"}
+    assert set(updates["binance"]) == {"price", "effective_price"}
+    assert decoder.state["binance"]["price"] == 150.5
+    assert decoder.state["okx"]["price"] == 152.0
+
+
+def test_keyframe_interval():
+    encoder = DeltaEncoder(keyframe_interval=3)
+    types = []
+    for price in (150.0, 150.1, 150.2, 150.3, 150.4):
+        types.append([frame_type for frame_type, _ in headers(encoder.encode(ranking(make_quote("binance", price))))])
+    assert types == [
+        [FRAME_VENUES, FRAME_KEYFRAME],
+        [FRAME_DELTA],
+        [FRAME_DELTA],
+        [FRAME_VENUES, FRAME_KEYFRAME],
+        [FRAME_DELTA],
+    ]
+
+
+def test_new_venue_mid_stream():
+    encoder = DeltaEncoder(keyframe_interval=30)
+    decoder = DeltaDecoder()
+    decoder.feed(b"".join(encoder.encode(ranking(make_quote("binance", 150.0)))))
+    frames = encoder.encode(ranking(make_quote("binance", 150.0), make_quote("kraken", 149.0)))
+    assert [frame_type for frame_type, _ in headers(frames)] == [FRAME_VENUES, FRAME_DELTA]
+    venues, (_, _, updates) = decoder.feed(b"".join(frames))
+    assert venues[0] == FRAME_VENUES
+    assert decoder.venues == {0: "binance", 1: "kraken"}
+    assert set(updates) == {"kraken"}
+    assert set(updates["kraken"]) == {"price", "effective_price", "liquidity", "flags"}
+
+
+def test_nan_liquidity_round_trips_without_spurious_deltas():
+    encoder = DeltaEncoder(keyframe_interval=30)
+    decoder = DeltaDecoder()
+    decoder.feed(b"".join(encoder.encode(ranking(make_quote("binance", 150.0)))))
+    assert math.isnan(decoder.state["binance"]["liquidity"])
+    ((_, _, updates),) = decoder.feed(b"".join(encoder.encode(ranking(make_quote("binance", 150.0)))))
+    assert updates == {}
+
+
+def test_frames_split_across_reads():
+    encoder = DeltaEncoder(keyframe_interval=30)
+    decoder = DeltaDecoder()
+    data = b"".join(encoder.encode(ranking(make_quote("binance", 150.0))))
+    assert decoder.feed(data[:5]) == []
+    assert len(decoder.feed(data[5:])) == 2
+    assert decoder.state["binance"]["price"] == 150.0
+
+
+def test_catch_up_keyframe_does_not_advance_sequence():
+    encoder = DeltaEncoder(keyframe_interval=30)
+    assert headers(encoder.encode(ranking(make_quote("binance", 150.0)))) == [(FRAME_VENUES, 1), (FRAME_KEYFRAME, 2)]
+    assert headers(encoder.keyframe(advance=False)) == [(FRAME_VENUES, 2), (FRAME_KEYFRAME, 2)]
+    assert headers(encoder.encode(ranking(make_quote("binance", 151.0)))) == [(FRAME_DELTA, 3)]
+
+
+def test_unix_socket_consumers_see_contiguous_sequences(tmp_path):
+    async def scenario():
+        stream = SnapshotStream(f"unix:{tmp_path / 'stream.sock'}", keyframe_interval=30)
+        await stream.start()
+        first_reader, first_writer = await asyncio.open_unix_connection(str(tmp_path / "stream.sock"))
+        await asyncio.sleep(0.05)
+        stream.publish(ranking(make_quote("binance", 150.0)))
+        await asyncio.sleep(0.05)
+        second_reader, second_writer = await asyncio.open_unix_connection(str(tmp_path / "stream.sock"))
+        await asyncio.sleep(0.05)
+        stream.publish(ranking(make_quote("binance", 151.0)))
+        await asyncio.sleep(0.05)
+        await stream.close()
+        first, second = await first_reader.read(), await second_reader.read()
+        first_writer.close()
+        second_writer.close()
+        return first, second
+
+    first, second = asyncio.run(scenario())
+
+    def sequences(data):
+        result = []
+        while data:
+            (length,) = LENGTH.unpack_from(data)
+            result.append(HEADER.unpack_from(data, LENGTH.size)[2])
+            data = data[LENGTH.size + length :]
+        return result
+
+    assert sequences(first) == [1, 2, 3]
+    assert sequences(second) == [2, 2, 3]
+    decoder = DeltaDecoder()
+    decoder.feed(second)
+    assert decoder.state["binance"]["price"] == 151.0